@@ -0,0 +1,82 @@
+import asyncio
+import argparse
+import time
+from patchright.async_api import async_playwright
+from post_scrapper import Scrapper
+from post_scrapper.targets.facebookPosts import FacebookBetter, POST_CHECK, POST_FIELDS
+
+
+def fixturePage(copies: int) -> str:
+    """Build a local feed page out of the saved feed markup in temp.txt."""
+    with open("temp.txt", encoding="utf-8") as f:
+        feed = f.read()
+    return f"<html><body>{feed * copies}</body></html>"
+
+
+async def extractHandles(fb: FacebookBetter) -> int:
+    s = fb.Scrapper
+    count = 0
+    for likeButton in await fb.page.query_selector_all('div[aria-label="Like"]'):
+        outerButtons = await s.getParent(likeButton, 2)
+        if len(await s.getChildren(outerButtons)) < 3:
+            continue
+        postDiv = await s.getParent(likeButton, 9)
+        possibleReelTag = await s.traverseElement(postDiv, [1])
+        await s.getAttr(possibleReelTag, 'aria-label')
+        await fb._checkSeeMore(postDiv)
+        await fb._getProfileName(postDiv)
+        await fb._getPostBody(postDiv)
+        timeTag = await fb._getTimeTag(postDiv)
+        if timeTag:
+            await fb._getURL(timeTag)
+        await fb._getReactions(postDiv)
+        count += 1
+    return count
+
+
+async def extractQuery(fb: FacebookBetter) -> int:
+    s = fb.Scrapper
+    count = 0
+    for likeButton in await fb.page.query_selector_all('div[aria-label="Like"]'):
+        check = await s.query(likeButton, POST_CHECK)
+        if check["buttons"] < 3:
+            continue
+        postDiv = await s.getParent(likeButton, 9)
+        await fb._checkSeeMore(postDiv)
+        await s.query(postDiv, POST_FIELDS)
+        count += 1
+    return count
+
+
+async def extractEvaluate(fb: FacebookBetter) -> int:
+    return len(await fb.extractPosts())
+
+
+async def main(copies: int, rounds: int):
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(fixturePage(copies))
+
+        s = Scrapper(headless=True)
+        s.page = page
+        fb = FacebookBetter("fixture", mentions=False)
+        fb.Scrapper = s
+        fb.page = page
+
+        for name, extract in (("handles", extractHandles), ("query", extractQuery), ("evaluate", extractEvaluate)):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                posts = await extract(fb)
+            elapsed = (time.perf_counter() - start) / rounds
+            print(f"{name:>8}: {posts} posts in {elapsed * 1000:.1f} ms per round")
+
+        await browser.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare per-handle, batched-query and evaluate extraction on a local fixture page")
+    parser.add_argument("--copies", type=int, default=20, help="times the saved feed is repeated")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.copies, args.rounds))
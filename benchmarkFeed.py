@@ -0,0 +1,38 @@
+import argparse
+import json
+from post_scrapper.bench import isolatedBenchmark, saveBaseline, compareBaseline
+
+
+def main(args):
+    failed = False
+    for mode in args.modes:
+        # each mode in its own process so peak memory isn't carried over between modes
+        result = isolatedBenchmark(
+            mode=mode, posts=args.posts, batch=args.batch, latency=args.latency, lazy=not args.eager,
+            pacing=args.pacing, scroll_engine=args.scroll_engine, timestamps=args.timestamps, timeout=args.timeout,
+        )
+        print(json.dumps(result, indent=2))
+        regressions = compareBaseline(result, args.baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION [{mode}] {regression}")
+        failed = failed or bool(regressions)
+        if args.save:
+            saveBaseline(result, args.baseline)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark FacebookBetter against a local infinite feed")
+    parser.add_argument("--modes", nargs="+", default=["dom", "evaluate", "snapshot"])
+    parser.add_argument("--posts", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per lazy-loaded batch")
+    parser.add_argument("--eager", action="store_true", help="serve every post in the initial page")
+    parser.add_argument("--pacing", default="adaptive", choices=["fixed", "adaptive"])
+    parser.add_argument("--scroll-engine", default="wheel", choices=["wheel", "page"])
+    parser.add_argument("--timestamps", default="hover", choices=["hover", "attribute"], help="how the feed exposes post times")
+    parser.add_argument("--timeout", type=float, default=600, help="fail a run that takes longer than this many seconds")
+    parser.add_argument("--baseline", default="bench_baseline.json")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--save", action="store_true", help="store these results as the new baseline")
+    raise SystemExit(main(parser.parse_args()))
@@ -1,19 +1,25 @@
+import sys
 import asyncio
 import traceback
 from post_scrapper import Scrapper
-from post_scrapper.targets.detection_check import detectionCheck
+from post_scrapper.targets.detection_check import detectionCheck, checkProfiles
 import logging
 
 
-async def main():
+async def main(profiles: list[str]):
     try:
+        if profiles:
+            # python botDetectionJob.py ./chromedata ./chromedata-2 ...
+            for result in await checkProfiles(profiles):
+                print(result.model_dump_json())
+            return
         async with Scrapper(headless=False) as s:
             job = detectionCheck()
             await s.setJob(job)
             await s.start()
-            
+
     except Exception:
         traceback.print_exc()
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,33 @@
+import asyncio
+import argparse
+from post_scrapper import Scrapper, Monitor
+from post_scrapper.dedupe import SeenStore
+
+
+async def on_new_post(post):
+    print(f"[{post.username}] {post.post_url} {post.content[:80]}")
+
+
+async def main(args):
+    async with Scrapper(headless=args.headless, interactive=False) as s:
+        monitor = Monitor(
+            s,
+            args.users,
+            on_post=on_new_post,
+            min_interval=args.min_interval,
+            max_interval=args.max_interval,
+            budget=args.budget,
+            seen_store=SeenStore(args.seen),
+        )
+        await monitor.run()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Keep polling Facebook profiles for new mentions")
+    parser.add_argument("users", nargs="+")
+    parser.add_argument("--min-interval", type=float, default=60)
+    parser.add_argument("--max-interval", type=float, default=3600)
+    parser.add_argument("--budget", type=float, default=900, help="browser seconds per hour")
+    parser.add_argument("--seen", default="./seen.db")
+    parser.add_argument("--headless", action="store_true")
+    asyncio.run(main(parser.parse_args()))
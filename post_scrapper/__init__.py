@@ -1,3 +1,12 @@
 from .scrapper import Scrapper
+from .query import Query
+from .scheduler import Scheduler, Job
+from .pool import BrowserPool
+from .monitor import Monitor
+from .profiles import ProfileManager
+from .intercept import InterceptPolicy
+from .sinks import Sink, JSONLSink, SQLiteSink, ParquetSink
+from .records import PostBatch
+from .metrics import Metrics, PrometheusExporter, JSONExporter
 
-__all__ = ["Scrapper"]
\ No newline at end of file
+__all__ = ["Scrapper", "Query", "Scheduler", "Job", "BrowserPool", "Monitor", "ProfileManager", "InterceptPolicy", "Sink", "JSONLSink", "SQLiteSink", "ParquetSink", "PostBatch", "Metrics", "PrometheusExporter", "JSONExporter"]
\ No newline at end of file
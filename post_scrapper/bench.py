@@ -0,0 +1,302 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import resource
+import tempfile
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+import lxml.html
+from .scrapper import Scrapper, log
+
+FEED_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Benchmark feed</title></head>
+<body><div role="feed" id="feed">{posts}</div>
+<div class="__fb-dark-mode" hidden style="position: fixed; top: 0; right: 0;"></div>
+<script>
+// Like Facebook, a time link only gets its permalink and tooltip once hovered
+const tooltip = document.querySelector(".__fb-dark-mode");
+document.addEventListener("mouseover", (e) => {{
+    const link = e.target.closest && e.target.closest("a[data-permalink]");
+    if (!link) return;
+    link.setAttribute("href", link.dataset.permalink);
+    tooltip.textContent = link.dataset.time;
+    tooltip.hidden = false;
+}});
+document.addEventListener("mouseout", (e) => {{
+    if (e.target.closest && e.target.closest("a[data-permalink]")) tooltip.hidden = true;
+}});
+let offset = {offset};
+let loading = false;
+let done = {done};
+window.addEventListener("scroll", async () => {{
+    if (loading || done) return;
+    if (window.scrollY + window.innerHeight < document.documentElement.scrollHeight - 1500) return;
+    loading = true;
+    const response = await fetch("/feed?offset=" + offset);
+    const html = await response.text();
+    if (!html) {{
+        done = true;
+    }} else {{
+        document.getElementById("feed").insertAdjacentHTML("beforeend", html);
+        offset += {batch};
+    }}
+    loading = false;
+}});
+</script>
+</body></html>
+"""
+
+STORY_MESSAGE = '//*[@data-ad-rendering-role="story_message"]'
+TIME_LINK = [1, 0, 1, 0, 1, 0, 0, 0, 0, 0]
+
+
+def _traverse(el, path: list[int]):
+    for idx in path:
+        children = [child for child in el if isinstance(child.tag, str)]
+        if idx >= len(children):
+            return None
+        el = children[idx]
+    return el
+
+
+class FeedServer:
+    """
+    Local infinite-scroll feed made of the saved Facebook markup in temp.txt.
+
+    Every post is the saved post with its own text and timestamp. As on
+    Facebook, the time link's href is a shared placeholder until the link is
+    hovered, which also shows the timestamp tooltip. With timestamps="attribute"
+    the link carries a data-utime timestamp instead, so no hover is needed (and
+    no permalink is read). The page shows `batch` posts and loads the next batch from
+    /feed when scrolled near the bottom, each fetch delayed by `latency`
+    seconds. With lazy=False every post is in the initial document.
+    `pages` maps further paths to HTML served as-is, such as stand-in pages
+    for the detection checks.
+    """
+
+    def __init__(
+        self,
+        posts: int = 200,
+        batch: int = 10,
+        latency: float = 0.2,
+        lazy: bool = True,
+        template: str = "temp.txt",
+        timestamps: str = "hover",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        pages: dict[str, str] | None = None
+    ):
+        self.posts = posts
+        self.batch = batch
+        self.latency = latency
+        self.lazy = lazy
+        self.timestamps = timestamps
+        self.host = host
+        self.port = port
+        self.pages = pages or {}
+        self._server: asyncio.AbstractServer | None = None
+        with open(template, encoding="utf-8") as f:
+            self._template = f.read()
+        self._rendered: dict[int, str] = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    async def __aenter__(self) -> "FeedServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.stop()
+
+    def renderPost(self, index: int) -> str:
+        if index not in self._rendered:
+            root = lxml.html.fragment_fromstring(self._template, create_parent="div")
+            for message in root.xpath(STORY_MESSAGE):
+                for child in list(message):
+                    message.remove(child)
+                message.text = f"Benchmark post {index}: the quick brown fox jumps over the lazy dog."
+            likes = root.xpath('//div[@aria-label="Like"]')
+            if likes:
+                post = likes[0]
+                for _ in range(9):
+                    post = post.getparent()
+                link = _traverse(post, TIME_LINK)
+                if link is not None:
+                    epoch = 1_700_000_000 + index * 60
+                    link.set("href", "?__cft__[0]=AZ&__tn__=%2CO%2CP-R#?fkj")
+                    if self.timestamps == "attribute":
+                        link.set("data-utime", str(epoch))
+                    else:
+                        link.set("data-permalink", f"/Benchmark/posts/{index}")
+                        link.set("data-time", datetime.fromtimestamp(epoch).strftime("%A %d %B %Y at %H:%M"))
+            self._rendered[index] = lxml.html.tostring(root, encoding="unicode")
+        return self._rendered[index]
+
+    def renderBatch(self, offset: int) -> str:
+        end = min(self.posts, offset + self.batch)
+        return "".join(self.renderPost(i) for i in range(offset, end))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            parts = request.decode().split(" ")
+            target = urlparse(parts[1] if len(parts) > 1 else "/")
+            status = "200 OK"
+            if target.path == "/":
+                first = self.posts if not self.lazy else self.batch
+                body = FEED_PAGE.format(
+                    posts="".join(self.renderPost(i) for i in range(min(first, self.posts))),
+                    offset=first,
+                    batch=self.batch,
+                    done="true" if first >= self.posts else "false",
+                )
+            elif target.path == "/feed":
+                await asyncio.sleep(self.latency)
+                offset = int(parse_qs(target.query).get("offset", ["0"])[0])
+                body = self.renderBatch(offset)
+            elif target.path in self.pages:
+                body = self.pages[target.path]
+            else:
+                status, body = "404 Not Found", ""
+            data = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/html; charset=utf-8\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data
+            )
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info(f"Benchmark feed on {self.url} ({self.posts} posts)")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def runBenchmark(
+    mode: str = "evaluate",
+    posts: int = 200,
+    batch: int = 10,
+    latency: float = 0.2,
+    lazy: bool = True,
+    pacing: str = "adaptive",
+    headless: bool = True,
+    scroll_engine: str = "wheel",
+    timestamps: str = "hover",
+    timeout: float | None = None
+) -> dict:
+    """
+    Scrape a local FeedServer with FacebookBetter and report throughput and memory.
+    peak_rss_mb is the whole process's peak; use isolatedBenchmark to compare
+    several configurations. A run still going after `timeout` seconds raises
+    TimeoutError, so a scrape that never ends fails the benchmark instead of hanging it.
+    """
+    from .targets.facebookPosts import FacebookBetter
+
+    async with FeedServer(posts, batch, latency, lazy, timestamps=timestamps) as server:
+        with tempfile.TemporaryDirectory(prefix="bench-chromedata-") as profile:
+            async with Scrapper(headless=headless, user_data_dir=profile, log_level=logging.WARNING, interactive=False, scroll_engine=scroll_engine) as s:
+                metrics = s.enableMetrics()
+                fb = FacebookBetter("bench", mentions=False, mode=mode, pacing=pacing)
+                fb.url = server.url
+                start = time.monotonic()
+                await s.setJob(fb)
+                try:
+                    await asyncio.wait_for(s.start(), timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"{mode} run with {pacing} pacing did not finish within {timeout:.0f}s") from None
+                elapsed = time.monotonic() - start
+                page = await s.pageMetrics()
+
+    return {
+        "mode": mode,
+        "pacing": pacing,
+        "scroll_engine": scroll_engine,
+        "timestamps": timestamps,
+        "posts_served": posts,
+        "batch": batch,
+        "latency": latency,
+        "lazy": lazy,
+        "posts": fb.emitted,
+        "seconds": elapsed,
+        "posts_per_second": fb.emitted / elapsed if elapsed else 0.0,
+        "cdp_calls_per_post": metrics.cdp_calls_per_post,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "renderer_heap_mb": page["js_heap_used"] / 1e6,
+        "renderer_nodes": page["nodes"],
+    }
+
+
+def _benchmarkProcess(kwargs: dict) -> dict:
+    result = asyncio.run(runBenchmark(**kwargs))
+    # largest reaped descendant: the snapshot parser workers, the driver and its browser
+    result["peak_child_rss_mb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return result
+
+
+def isolatedBenchmark(**kwargs) -> dict:
+    """runBenchmark in a fresh process, so peak RSS belongs to this run alone."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+        return pool.submit(_benchmarkProcess, kwargs).result()
+
+
+# metric -> True when bigger is better
+TRACKED = {
+    "posts_per_second": True,
+    "cdp_calls_per_post": False,
+    "peak_rss_mb": False,
+    "peak_child_rss_mb": False,
+    "renderer_heap_mb": False,
+}
+
+# Settings that must match for two results to be comparable
+CONFIG = ("mode", "pacing", "scroll_engine", "timestamps", "posts_served", "batch", "latency", "lazy")
+
+
+def configKey(result: dict) -> str:
+    return ",".join(f"{name}={result.get(name)}" for name in CONFIG)
+
+
+def saveBaseline(result: dict, path: str = "bench_baseline.json"):
+    baselines = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            baselines = json.load(f)
+    baselines[configKey(result)] = result
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2)
+
+
+def compareBaseline(result: dict, path: str = "bench_baseline.json", tolerance: float = 0.2) -> list[str]:
+    """Metrics more than `tolerance` worse than the saved baseline for the same configuration."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f).get(configKey(result))
+    if not baseline:
+        return []
+    regressions = []
+    for metric, higherIsBetter in TRACKED.items():
+        old, new = baseline.get(metric), result.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (change < -tolerance) if higherIsBetter else (change > tolerance):
+            regressions.append(f"{metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
@@ -0,0 +1,160 @@
+import time
+import sqlite3
+import hashlib
+from collections import OrderedDict
+from typing import Literal
+from urllib.parse import urlparse, parse_qs
+
+# Query parameters that identify a single post on an otherwise generic path
+# (permalink.php, story.php, photo/, watch/)
+STORY_ID_PARAMS = ("story_fbid", "fbid", "v")
+
+
+def normalize(text: str) -> str:
+    return text.replace(" ", "").replace("\n", "").replace(" ", "").replace("Verifiedaccount", "")
+
+
+def isPermalink(url: str | None) -> bool:
+    """
+    True for URLs that point at one post. Un-hovered time links are only a
+    fragment ("#?fkj") and profile links have a single path segment, so
+    neither identifies a post.
+    """
+    if not url:
+        return False
+    parsed = urlparse(url)
+    if len([segment for segment in parsed.path.split("/") if segment]) >= 2:
+        return True
+    query = parse_qs(parsed.query)
+    return any(query.get(param) for param in STORY_ID_PARAMS)
+
+
+def postDigest(username: str, content: str) -> str:
+    key = f"{normalize(username)}\x00{normalize(content)}".encode("utf-8")
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+class PostIndex:
+    """
+    Constant-time "have we seen this post" index with bounded memory.
+
+    Posts are keyed on a digest of the normalized (username, content) pair and,
+    when it is a real permalink, on the post URL. policy="lru" keeps the `max_size` most recently
+    seen keys; policy="window" forgets keys not seen for `window` seconds (still
+    capped at `max_size`).
+    """
+
+    def __init__(
+        self,
+        policy: Literal["lru", "window"] = "lru",
+        max_size: int = 10_000,
+        window: float = 24 * 60 * 60
+    ):
+        if policy not in ("lru", "window"):
+            raise ValueError(f"Unknown retention policy: {policy}")
+        self.policy = policy
+        self.max_size = max_size
+        self.window = window
+        self._keys: OrderedDict[str, float] = OrderedDict()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def keysFor(self, username: str, content: str, url: str | None = None) -> list[str]:
+        keys = [postDigest(username, content)]
+        if isPermalink(url):
+            keys.append(f"url:{url}")
+        return keys
+
+    def _evict(self, now: float):
+        if self.policy == "window":
+            cutoff = now - self.window
+            while self._keys:
+                key, seen = next(iter(self._keys.items()))
+                if seen >= cutoff:
+                    break
+                self._keys.popitem(last=False)
+        while len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+
+    def contains(self, username: str, content: str, url: str | None = None) -> bool:
+        return self.containsKeys(self.keysFor(username, content, url))
+
+    def containsKeys(self, keys: list[str]) -> bool:
+        now = time.monotonic()
+        self._evict(now)
+        found = False
+        for key in keys:
+            if key in self._keys:
+                self._keys[key] = now
+                self._keys.move_to_end(key)
+                found = True
+        return found
+
+    def add(self, username: str, content: str, url: str | None = None):
+        self.addKeys(self.keysFor(username, content, url))
+
+    def addKeys(self, keys: list[str]):
+        now = time.monotonic()
+        for key in keys:
+            self._keys[key] = now
+            self._keys.move_to_end(key)
+        self._evict(now)
+
+    def clear(self):
+        self._keys.clear()
+
+
+class SeenStore:
+    """
+    On-disk record of the PostIndex keys already emitted, per profile URL, so
+    a restarted run knows what it has already stored.
+
+    add() runs on the event loop, so writes are committed every `commit_every`
+    adds (and on flush() or close()) rather than per post, and WAL commits
+    skip the fsync (synchronous=NORMAL). A crash loses at most the uncommitted
+    keys, whose posts are then emitted again.
+    """
+
+    def __init__(self, path: str = "./seen.db", commit_every: int = 50):
+        self.path = path
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "profile TEXT NOT NULL, key TEXT NOT NULL, seen REAL NOT NULL, PRIMARY KEY (profile, key))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS seen_recent ON seen (profile, seen)")
+        self._db.commit()
+
+    def __str__(self):
+        return f"SeenStore({self.path})"
+
+    def keys(self, profile: str, limit: int | None = None) -> list[str]:
+        """Keys seen for `profile`, oldest first, at most the `limit` most recent."""
+        rows = self._db.execute(
+            "SELECT key FROM seen WHERE profile = ? ORDER BY seen DESC LIMIT ?",
+            (profile, -1 if limit is None else limit)
+        ).fetchall()
+        return [row[0] for row in reversed(rows)]
+
+    def add(self, profile: str, keys: list[str]):
+        now = time.time()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO seen (profile, key, seen) VALUES (?, ?, ?)",
+            [(profile, key, now) for key in keys]
+        )
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        self._db.commit()
+        self._uncommitted = 0
+
+    def close(self):
+        self.flush()
+        self._db.close()
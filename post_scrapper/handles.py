@@ -0,0 +1,38 @@
+import asyncio
+import contextvars
+from patchright.async_api import JSHandle
+
+
+class HandleStats:
+    """Counts of element handles created and disposed through a Scrapper."""
+
+    def __init__(self):
+        self.created = 0
+        self.disposed = 0
+
+    def __str__(self):
+        return f"HandleStats(created={self.created}, disposed={self.disposed}, live={self.live})"
+
+    @property
+    def live(self) -> int:
+        return self.created - self.disposed
+
+
+class HandleArena:
+    """Collects the handles created while it is active and disposes them all on exit."""
+
+    def __init__(self, stats: HandleStats):
+        self.stats = stats
+        self.handles: list[JSHandle] = []
+
+    def track(self, handle: JSHandle):
+        self.handles.append(handle)
+
+    async def dispose(self):
+        handles, self.handles = self.handles, []
+        results = await asyncio.gather(*(h.dispose() for h in handles), return_exceptions=True)
+        # a handle whose page or frame is already gone counts as released too
+        self.stats.disposed += len(results)
+
+
+currentArena: contextvars.ContextVar[HandleArena | None] = contextvars.ContextVar("currentArena", default=None)
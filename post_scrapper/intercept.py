@@ -0,0 +1,209 @@
+import re
+import asyncio
+import fnmatch
+import weakref
+from collections import Counter
+from typing import Iterable
+from patchright.async_api import BrowserContext, CDPSession, Page, Request, Route, Response
+
+TRACKERS = [
+    "*://*.doubleclick.net/*",
+    "*://*.google-analytics.com/*",
+    "*://*.googletagmanager.com/*",
+    "*://*.facebook.com/ajax/bz*",
+    "*://*.facebook.com/ajax/bnzai*",
+    "*://*.facebook.com/tr/*",
+]
+
+# Layout is left alone (documents, stylesheets, scripts and XHR are never
+# blocked by type), so bounding boxes, visibility and hover tooltips that the
+# targets rely on still work.
+PRESETS = {
+    "text-only": {
+        "deny_types": ["image", "media", "font"],
+        "deny_urls": TRACKERS + ["*://video*.fbcdn.net/*", "*://*.fbcdn.net/*.mp4*"],
+    },
+    "no-media": {
+        "deny_types": ["media"],
+        "deny_urls": ["*://video*.fbcdn.net/*", "*://*.fbcdn.net/*.mp4*"],
+    },
+    "no-trackers": {
+        "deny_urls": TRACKERS,
+    },
+}
+
+# File extensions standing in for resource types when blocking through CDP,
+# which only matches URLs. Facebook's CDN keeps them in its paths.
+TYPE_EXTENSIONS = {
+    "image": ["jpg", "jpeg", "png", "gif", "webp", "avif", "ico", "svg"],
+    "media": ["mp4", "webm", "m4a", "m4v", "mp3", "ogg"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+}
+
+# Fallback size (bytes) per resource type, used until real responses of that
+# type have been seen.
+DEFAULT_SIZES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 60_000,
+    "script": 50_000,
+    "stylesheet": 20_000,
+}
+
+
+def _compile(patterns: Iterable[str | re.Pattern]) -> list[re.Pattern]:
+    return [p if isinstance(p, re.Pattern) else re.compile(fnmatch.translate(p)) for p in patterns]
+
+
+class InterceptPolicy:
+    """
+    Allow/deny rules for Scrapper's route interception.
+
+    URL patterns are globs (or compiled regexes). allow_urls wins over
+    deny_urls, which wins over the resource-type rules. With `allow_types`
+    set, every other resource type is denied.
+
+    A policy that only denies (globs and the types in TYPE_EXTENSIONS) is handed to
+    Chrome as CDP Network.setBlockedURLs patterns on each page, so allowed
+    requests never leave the browser and the HTTP cache stays on. Any other
+    policy routes every request through `handle`, which disables the cache.
+    """
+
+    def __init__(
+        self,
+        deny_types: Iterable[str] = (),
+        allow_types: Iterable[str] | None = None,
+        deny_urls: Iterable[str | re.Pattern] = (),
+        allow_urls: Iterable[str | re.Pattern] = ()
+    ):
+        self.deny_types = set(deny_types)
+        self.allow_types = set(allow_types) if allow_types is not None else None
+        self._deny_globs = list(deny_urls)
+        self.deny_urls = _compile(deny_urls)
+        self.allow_urls = _compile(allow_urls)
+
+        self.allowed = Counter()
+        self.blocked = Counter()
+        self._bytes_seen = Counter()
+        self._responses_seen = Counter()
+        self._sessions = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def preset(cls, name: str) -> "InterceptPolicy":
+        if name not in PRESETS:
+            raise ValueError(f"Unknown intercept preset: {name}")
+        return cls(**PRESETS[name])
+
+    def __str__(self):
+        return f"InterceptPolicy(blocked={sum(self.blocked.values())}, allowed={sum(self.allowed.values())})"
+
+    def allows(self, url: str, resource_type: str) -> bool:
+        if any(p.match(url) for p in self.allow_urls):
+            return True
+        if any(p.match(url) for p in self.deny_urls):
+            return False
+        if self.allow_types is not None:
+            return resource_type in self.allow_types
+        return resource_type not in self.deny_types
+
+    def blockedURLs(self) -> list[str] | None:
+        """This policy as Network.setBlockedURLs patterns, or None when it needs routing."""
+        if self.allow_types is not None or self.allow_urls:
+            return None
+        if any(not isinstance(p, str) or "?" in p or "[" in p for p in self._deny_globs):
+            return None
+        if any(t not in TYPE_EXTENSIONS for t in self.deny_types):
+            return None
+        extensions = [ext for t in sorted(self.deny_types) for ext in TYPE_EXTENSIONS[t]]
+        return self._deny_globs + [p for ext in extensions for p in (f"*.{ext}", f"*.{ext}?*")]
+
+    async def install(self, context: BrowserContext):
+        """Apply this policy to `context` and every page opened in it."""
+        if self.blockedURLs() is None:
+            await context.route("**/*", self.handle)
+        else:
+            for page in context.pages:
+                await self.attach(page)
+            # pages the caller doesn't attach itself, e.g. popups
+            context.on("page", self.attach)
+            context.on("requestfinished", self.onFinished)
+            context.on("requestfailed", self.onFailed)
+        context.on("response", self.onResponse)
+
+    async def uninstall(self, context: BrowserContext):
+        if self.blockedURLs() is None:
+            await context.unroute("**/*", self.handle)
+        else:
+            context.remove_listener("page", self.attach)
+            context.remove_listener("requestfinished", self.onFinished)
+            context.remove_listener("requestfailed", self.onFailed)
+            for page in context.pages:
+                blocking = self._sessions.pop(page, None)
+                if blocking is not None and not page.is_closed():
+                    session = await blocking
+                    await session.send("Network.setBlockedURLs", {"urls": []})
+                    await session.detach()
+        context.remove_listener("response", self.onResponse)
+
+    async def attach(self, page: Page):
+        """Block this policy's URLs on `page` before it navigates; a no-op for routed policies."""
+        urls = self.blockedURLs()
+        if urls is None or page.is_closed():
+            return
+        if page not in self._sessions:
+            # the "page" event and the page's opener may both attach it
+            self._sessions[page] = asyncio.ensure_future(self._block(page, urls))
+        await self._sessions[page]
+
+    async def _block(self, page: Page, urls: list[str]) -> CDPSession:
+        session = await page.context.new_cdp_session(page)
+        await session.send("Network.enable")
+        await session.send("Network.setBlockedURLs", {"urls": urls})
+        return session
+
+    def onFinished(self, request: Request):
+        self.allowed[request.resource_type] += 1
+
+    def onFailed(self, request: Request):
+        if request.failure and "ERR_BLOCKED_BY_CLIENT" in request.failure:
+            self.blocked[request.resource_type] += 1
+
+    async def handle(self, route: Route):
+        request = route.request
+        resource_type = request.resource_type
+        if self.allows(request.url, resource_type):
+            self.allowed[resource_type] += 1
+            await route.continue_()
+        else:
+            self.blocked[resource_type] += 1
+            await route.abort("blockedbyclient")
+
+    def onResponse(self, response: Response):
+        """Record real response sizes so bytes_saved tracks the current site."""
+        length = response.headers.get("content-length")
+        if length and length.isdigit():
+            resource_type = response.request.resource_type
+            self._bytes_seen[resource_type] += int(length)
+            self._responses_seen[resource_type] += 1
+
+    def _averageSize(self, resource_type: str) -> int:
+        if self._responses_seen[resource_type]:
+            return self._bytes_seen[resource_type] // self._responses_seen[resource_type]
+        return DEFAULT_SIZES.get(resource_type, 10_000)
+
+    @property
+    def requests_saved(self) -> int:
+        return sum(self.blocked.values())
+
+    @property
+    def bytes_saved(self) -> int:
+        """Estimate: blocked requests times the average size seen for their type."""
+        return sum(count * self._averageSize(t) for t, count in self.blocked.items())
+
+    def stats(self) -> dict:
+        return {
+            "requests_saved": self.requests_saved,
+            "bytes_saved": self.bytes_saved,
+            "blocked": dict(self.blocked),
+            "allowed": dict(self.allowed),
+        }
@@ -0,0 +1,256 @@
+import json
+import time
+import types
+import asyncio
+import functools
+import logging
+from bisect import bisect_left
+from collections import Counter
+
+log = logging.getLogger("Scrapper")
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# Scrapper primitives that reach the browser through page or mouse calls;
+# those inner calls are what get counted as CDP round-trips.
+SCRAPPER_PRIMITIVES = [
+    "open", "scroll", "scrollTo", "currentScrollPos", "html", "snapshot", "pageMetrics", "convertTag",
+    "updateTag", "updateTags", "query",
+]
+# Primitives that make exactly one element handle call; each counts as a
+# CDP round-trip itself.
+HANDLE_PRIMITIVES = [
+    "getText", "getAttr", "getParent", "getChildren", "traverseElement", "attribSearch",
+    "evaluateOn", "querySelector", "isVisible", "click", "boundingBox",
+]
+PAGE_METHODS = [
+    "goto", "evaluate", "evaluate_handle", "query_selector", "query_selector_all", "wait_for_selector", "content",
+]
+MOUSE_METHODS = ["move", "wheel", "click"]
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.buckets[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[int]:
+        total, out = 0, []
+        for count in self.buckets:
+            total += count
+            out.append(total)
+        return out
+
+
+class Metrics:
+    """
+    Call counts, latency histograms and errors for instrumented methods, plus
+    post and CDP round-trip totals.
+
+    Nothing is measured until instrument() wraps an object's methods, so a
+    Scrapper without metrics runs its original, unwrapped methods.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.errors = Counter()
+        self.latency: dict[str, Histogram] = {}
+        self.cdp_calls = 0
+        self.posts = 0
+        self.started = time.monotonic()
+
+    def observe(self, name: str, seconds: float, error: bool = False, cdp: bool = False):
+        self.calls[name] += 1
+        if error:
+            self.errors[name] += 1
+        if cdp:
+            self.cdp_calls += 1
+        histogram = self.latency.get(name)
+        if histogram is None:
+            histogram = self.latency[name] = Histogram()
+        histogram.observe(seconds)
+
+    def postEmitted(self):
+        self.posts += 1
+
+    @property
+    def posts_per_minute(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.posts / elapsed * 60 if elapsed > 0 else 0.0
+
+    @property
+    def cdp_calls_per_post(self) -> float:
+        return self.cdp_calls / self.posts if self.posts else 0.0
+
+    def _wrap(self, fn, name: str, cdp: bool):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def timed(*args, **kwargs):
+                start = time.perf_counter()
+                error = False
+                try:
+                    return await fn(*args, **kwargs)
+                except BaseException:
+                    error = True
+                    raise
+                finally:
+                    self.observe(name, time.perf_counter() - start, error, cdp)
+        else:
+            @functools.wraps(fn)
+            def timed(*args, **kwargs):
+                start = time.perf_counter()
+                error = False
+                try:
+                    return fn(*args, **kwargs)
+                except BaseException:
+                    error = True
+                    raise
+                finally:
+                    self.observe(name, time.perf_counter() - start, error, cdp)
+        timed.__instrumented__ = True
+        return timed
+
+    def instrument(self, obj, names: list[str], prefix: str, cdp: bool = False):
+        """Replace `obj.<name>` for each name with a timed wrapper recorded as `prefix.name`."""
+        for name in names:
+            method = getattr(obj, name, None)
+            if method is None or getattr(method, "__instrumented__", False):
+                continue
+            if isinstance(method, types.MethodType) and method.__self__ is obj:
+                # wrap the function, so copies of `obj` (Scrapper.bind) can rebind it
+                setattr(obj, name, types.MethodType(self._wrap(method.__func__, f"{prefix}.{name}", cdp), obj))
+            else:
+                setattr(obj, name, self._wrap(method, f"{prefix}.{name}", cdp))
+
+    def instrumentPage(self, page):
+        self.instrument(page, PAGE_METHODS, "page", cdp=True)
+        self.instrument(page.mouse, MOUSE_METHODS, "mouse", cdp=True)
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime": time.monotonic() - self.started,
+            "posts": self.posts,
+            "posts_per_minute": self.posts_per_minute,
+            "cdp_calls": self.cdp_calls,
+            "cdp_calls_per_post": self.cdp_calls_per_post,
+            "calls": {
+                name: {
+                    "count": histogram.count,
+                    "errors": self.errors[name],
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "total": histogram.sum,
+                }
+                for name, histogram in sorted(self.latency.items())
+            },
+        }
+
+    def prometheus(self) -> str:
+        lines = [
+            "# TYPE scrapper_calls_total counter",
+            *(f'scrapper_calls_total{{name="{n}"}} {c}' for n, c in sorted(self.calls.items())),
+            "# TYPE scrapper_errors_total counter",
+            *(f'scrapper_errors_total{{name="{n}"}} {c}' for n, c in sorted(self.errors.items())),
+            "# TYPE scrapper_latency_seconds histogram",
+        ]
+        for name, histogram in sorted(self.latency.items()):
+            for bound, count in zip(BUCKETS, histogram.cumulative()):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'scrapper_latency_seconds_bucket{{name="{name}",le="{le}"}} {count}')
+            lines.append(f'scrapper_latency_seconds_sum{{name="{name}"}} {histogram.sum}')
+            lines.append(f'scrapper_latency_seconds_count{{name="{name}"}} {histogram.count}')
+        lines += [
+            "# TYPE scrapper_posts_total counter",
+            f"scrapper_posts_total {self.posts}",
+            "# TYPE scrapper_cdp_calls_total counter",
+            f"scrapper_cdp_calls_total {self.cdp_calls}",
+            "# TYPE scrapper_posts_per_minute gauge",
+            f"scrapper_posts_per_minute {self.posts_per_minute}",
+            "# TYPE scrapper_cdp_calls_per_post gauge",
+            f"scrapper_cdp_calls_per_post {self.cdp_calls_per_post}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusExporter:
+    """Serves Metrics in the Prometheus text format at http://host:port/metrics."""
+
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 9464):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: asyncio.AbstractServer | None = None
+
+    async def __aenter__(self) -> "PrometheusExporter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            if request.split(b" ")[1:2] == [b"/metrics"]:
+                status, body = "200 OK", self.metrics.prometheus().encode()
+            else:
+                status, body = "404 Not Found", b""
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        log.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+class JSONExporter:
+    """Writes a Metrics snapshot to `path` every `interval` seconds (and once on stop)."""
+
+    def __init__(self, metrics: Metrics, path: str = "metrics.json", interval: float = 10.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "JSONExporter":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.stop()
+
+    def write(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.metrics.snapshot(), f, indent=2)
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await asyncio.to_thread(self.write)
+
+    async def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await asyncio.to_thread(self.write)
@@ -0,0 +1,193 @@
+import time
+import inspect
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable
+from .scrapper import log
+from .dedupe import SeenStore
+
+
+class Watch:
+    """Polling state of one watched profile."""
+
+    def __init__(self, user: str, mentions: bool, interval: float):
+        self.user = user
+        self.mentions = mentions
+        self.interval = interval
+        self.due = 0.0
+        self.rate = 0.0
+        self.watermark: int | None = None
+        self.last_polled: float | None = None
+        self.polls = 0
+        self.emitted = 0
+        self.failures = 0
+        self.browser_seconds = 0.0
+
+    def __str__(self):
+        return f"Watch({self.user}, every {self.interval:.0f}s, {self.rate * 3600:.1f} posts/h)"
+
+
+class Monitor:
+    """
+    Keeps polling many Facebook profiles for new posts.
+
+    Each profile is re-visited on its own interval with FacebookBetter(recent=True),
+    so every poll sorts by most recent and stops once `stop_after_known` posts
+    from earlier polls (tracked in `seen_store`) show up in a row. A poll that
+    never catches up is cut off after `poll_timeout` seconds.
+
+    The interval follows an EWMA (weight `alpha`) of the page's posting rate,
+    aiming at `target_posts` new posts per poll within [min_interval,
+    max_interval]; a page with no posts yet doubles its interval each poll.
+
+    Only posts newer than the page's watermark (the newest epoch emitted so
+    far) reach `on_post`; posts without a timestamp (epoch 0) are left to the
+    seen_store dedupe. The first poll of a page only sets the watermark unless
+    `backfill` is set.
+
+    Polls share `budget` seconds of browser time per rolling hour: once it is
+    spent, polls wait for older ones to age out. With `concurrency` > 1 the
+    cap can be overshot by the polls already running.
+
+    `source` is a Scrapper or BrowserPool; every poll runs on a leased page.
+    """
+
+    def __init__(
+        self,
+        source,
+        users: list[str],
+        on_post: Callable[[Any], Awaitable[None] | None] | None = None,
+        mentions: bool = True,
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+        target_posts: float = 3.0,
+        alpha: float = 0.3,
+        budget: float = 900.0,
+        concurrency: int = 1,
+        poll_timeout: float = 120.0,
+        seen_store: SeenStore | None = None,
+        stop_after_known: int = 3,
+        backfill: bool = False,
+        params: dict | None = None
+    ):
+        self.source = source
+        self.on_post = on_post
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_posts = target_posts
+        self.alpha = alpha
+        self.budget = budget
+        self.poll_timeout = poll_timeout
+        self.seen_store = seen_store if seen_store is not None else SeenStore()
+        self.stop_after_known = stop_after_known
+        self.backfill = backfill
+        self.params = params or {}
+        self.watches = {user: Watch(user, mentions, min_interval) for user in users}
+        self._slots = asyncio.Semaphore(concurrency)
+        self._budgetLock = asyncio.Lock()
+        self._spent: deque[tuple[float, float]] = deque()
+        self._stop = asyncio.Event()
+
+    def __str__(self):
+        return f"Monitor({len(self.watches)} pages, {self.spent():.0f}/{self.budget:.0f}s browser time this hour)"
+
+    def spent(self) -> float:
+        """Browser seconds used by polls that finished in the last hour."""
+        cutoff = time.monotonic() - 3600
+        while self._spent and self._spent[0][0] < cutoff:
+            self._spent.popleft()
+        return sum(seconds for _, seconds in self._spent)
+
+    def stop(self):
+        self._stop.set()
+
+    async def run(self):
+        """Poll every watched page until stop() is called."""
+        self._stop.clear()
+        tasks = [asyncio.create_task(self._loop(watch)) for watch in self.watches.values()]
+        try:
+            await self._stop.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self, watch: Watch):
+        while True:
+            delay = watch.due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with self._slots:
+                await self._waitForBudget()
+                await self.poll(watch)
+
+    async def _waitForBudget(self):
+        async with self._budgetLock:
+            while self.spent() >= self.budget:
+                wait = self._spent[0][0] + 3600 - time.monotonic()
+                log.info(f"{self}: browser time budget spent, waiting {wait:.0f}s")
+                await asyncio.sleep(max(wait, 1))
+
+    async def poll(self, watch: Watch) -> int:
+        """Visit one page once; returns how many posts were emitted."""
+        from .targets.facebookPosts import FacebookBetter
+
+        first = watch.watermark is None
+        newest = watch.watermark or 0
+        emitted = 0
+
+        async def onPost(post):
+            nonlocal newest, emitted
+            if post.epoch:
+                newest = max(newest, post.epoch)
+                if watch.watermark is not None and post.epoch <= watch.watermark:
+                    return
+            if first and not self.backfill:
+                return
+            emitted += 1
+            if self.on_post:
+                result = self.on_post(post)
+                if inspect.isawaitable(result):
+                    await result
+
+        target = FacebookBetter(
+            watch.user,
+            mentions=watch.mentions,
+            recent=True,
+            on_post=onPost,
+            seen_store=self.seen_store,
+            stop_after_known=self.stop_after_known,
+            **self.params
+        )
+        started = time.monotonic()
+        try:
+            async with self.source.lease() as view:
+                await asyncio.wait_for(target.start(view), self.poll_timeout)
+        except asyncio.TimeoutError:
+            log.info(f"{target} did not catch up within {self.poll_timeout:.0f}s")
+        except Exception as e:
+            watch.failures += 1
+            log.warning(f"Polling {target} failed", exc_info=e)
+        finished = time.monotonic()
+
+        seconds = finished - started
+        self._spent.append((finished, seconds))
+        watch.browser_seconds += seconds
+        watch.polls += 1
+        watch.emitted += emitted
+        watch.watermark = newest
+        self._adapt(watch, 0 if first else emitted, finished)
+        log.info(f"{watch}: {emitted} new posts in {seconds:.1f}s, next poll in {watch.interval:.0f}s")
+        return emitted
+
+    def _adapt(self, watch: Watch, new_posts: int, now: float):
+        if watch.last_polled is not None:
+            observed = new_posts / max(now - watch.last_polled, 1.0)
+            watch.rate = self.alpha * observed + (1 - self.alpha) * watch.rate
+        watch.last_polled = now
+        if watch.rate > 0:
+            interval = self.target_posts / watch.rate
+        else:
+            interval = watch.interval * 2
+        watch.interval = min(max(interval, self.min_interval), self.max_interval)
+        watch.due = now + watch.interval
@@ -0,0 +1,128 @@
+import time
+import random
+import asyncio
+from patchright.async_api import Request
+
+PAGE_STATE_JS = """
+() => ({
+    height: document.documentElement.scrollHeight,
+    bottom: window.scrollY + window.innerHeight,
+})
+"""
+
+
+class ScrollPacer:
+    """
+    Adaptive replacement for a fixed scroll schedule.
+
+    Each step() is told how many new posts the previous scroll produced. While
+    the feed keeps delivering, the distance grows and the delay shrinks; when
+    a scroll brings nothing, the pacer waits for in-flight requests to settle
+    and takes smaller steps. Distance and delay stay inside the given bounds and
+    are jittered. The feed is considered finished after `end_patience` steps at
+    the bottom of the page with no height growth and no pending requests.
+    """
+
+    def __init__(
+        self,
+        scrapper,
+        min_distance: int = 400,
+        max_distance: int = 2000,
+        min_delay: float = 0.1,
+        max_delay: float = 3.0,
+        end_patience: int = 5
+    ):
+        self.Scrapper = scrapper
+        self.min_distance = min_distance
+        self.max_distance = max_distance
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.end_patience = end_patience
+
+        self.distance = (min_distance + max_distance) / 2
+        self.delay = min_delay
+        self.inflight = 0
+        self.posts = 0
+        self.steps = 0
+        self.ended = False
+        self._height = 0
+        self._stuck = 0
+        self._started = time.monotonic()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._page = None
+
+    def __str__(self):
+        return f"ScrollPacer(distance={self.distance:.0f}, delay={self.delay:.2f}, {self.posts_per_minute:.1f} posts/min)"
+
+    def _onRequest(self, request: Request):
+        if request.resource_type in ("xhr", "fetch"):
+            self.inflight += 1
+            self._idle.clear()
+
+    def _onRequestDone(self, request: Request):
+        if request.resource_type in ("xhr", "fetch"):
+            self.inflight = max(0, self.inflight - 1)
+            if not self.inflight:
+                self._idle.set()
+
+    def start(self):
+        self._page = self.Scrapper.page
+        self._page.on("request", self._onRequest)
+        self._page.on("requestfinished", self._onRequestDone)
+        self._page.on("requestfailed", self._onRequestDone)
+        self._started = time.monotonic()
+
+    def stop(self):
+        if self._page is not None:
+            self._page.remove_listener("request", self._onRequest)
+            self._page.remove_listener("requestfinished", self._onRequestDone)
+            self._page.remove_listener("requestfailed", self._onRequestDone)
+            self._page = None
+
+    @property
+    def posts_per_minute(self) -> float:
+        elapsed = time.monotonic() - self._started
+        return self.posts / elapsed * 60 if elapsed > 0 else 0.0
+
+    async def _networkIdle(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def step(self, new_posts: int = 0) -> bool:
+        """Scroll once, paced by how the last one went. Returns False at the end of the feed."""
+        if self._page is None:
+            self.start()
+        self.steps += 1
+        self.posts += new_posts
+
+        state = await self.Scrapper.page.evaluate(PAGE_STATE_JS)
+        grew = state["height"] > self._height
+        self._height = state["height"]
+
+        if new_posts:
+            self.distance = min(self.max_distance, self.distance * 1.25)
+            self.delay = max(self.min_delay, self.delay * 0.7)
+            self._stuck = 0
+        else:
+            idle = await self._networkIdle(self.max_delay)
+            atBottom = state["bottom"] >= state["height"] - 2
+            if atBottom and not grew and idle:
+                self._stuck += 1
+                if self._stuck >= self.end_patience:
+                    self.ended = True
+                    self.Scrapper.log.info(f"Reached end of feed: {self}")
+                    return False
+            elif grew:
+                self._stuck = 0
+            self.distance = max(self.min_distance, self.distance * 0.75)
+            self.delay = min(self.max_delay, self.delay * 1.5)
+
+        distance = int(self.distance * random.uniform(0.85, 1.15))
+        await self.Scrapper.scroll(0, distance, duration=0.1, steps=30)
+        await asyncio.sleep(self.delay * random.uniform(0.8, 1.2))
+        self.Scrapper.log.debug(str(self))
+        return True
@@ -0,0 +1,189 @@
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+from patchright.async_api import async_playwright, Browser, BrowserContext, Page
+from .scrapper import Scrapper, log
+from .intercept import InterceptPolicy
+
+# Playwright's own default for actions and navigations, in milliseconds
+DEFAULT_TIMEOUT = 30_000
+
+
+class PooledContext:
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.idle: list[Page] = []
+        self.leased = 0
+
+    @property
+    def pages(self) -> int:
+        return len(self.idle) + self.leased
+
+
+class BrowserPool:
+    """
+    Keeps one browser and `size` contexts warm and leases pages out of them.
+
+    Every context is created from the same storage state (cookies and local
+    storage), which is written back on exit. When `storage_state` doesn't
+    exist yet it is seeded from the persistent `user_data_dir` profile the
+    Scrapper logs in with, which must not be open in another browser. A released page is reset to
+    about:blank and kept idle for the next lease; a page that fails its health
+    check is replaced. At most `pages_per_context` pages live in one context.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        pages_per_context: int = 4,
+        headless: bool = False,
+        storage_state: str | None = "./chromedata/state.json",
+        user_data_dir: str | None = "./chromedata",
+        health_timeout: float = 2.0,
+        log_level=logging.INFO,
+        intercept: InterceptPolicy | str | None = None,
+        scroll_engine: str = "wheel"
+    ):
+        self.size = size
+        self.pages_per_context = pages_per_context
+        self.headless = headless
+        self.storage_state = os.path.abspath(storage_state) if storage_state else None
+        self.user_data_dir = os.path.abspath(user_data_dir) if user_data_dir else None
+        self.health_timeout = health_timeout
+        self.intercept = InterceptPolicy.preset(intercept) if isinstance(intercept, str) else intercept
+        self._pw_ctx = None
+        self.playwright = None
+        self.browser: Browser | None = None
+        self.contexts: list[PooledContext] = []
+        self._slots = asyncio.Semaphore(size * pages_per_context)
+        self._lock = asyncio.Lock()
+        self.scrapper = Scrapper(headless=headless, log_level=log_level, scroll_engine=scroll_engine)
+        self.log = log
+
+    async def __aenter__(self) -> "BrowserPool":
+        self._pw_ctx = async_playwright()
+        self.playwright = await self._pw_ctx.__aenter__()
+        log.debug(f"Launching pooled browser, headless={self.headless}")
+        await self._seedStorageState()
+        self.browser = await self.playwright.chromium.launch(channel="chrome", headless=self.headless)
+        for _ in range(self.size):
+            self.contexts.append(PooledContext(await self._newContext()))
+
+        self.scrapper.playwright = self.playwright
+        self.scrapper.browser = self.browser
+        self.scrapper.context = self.contexts[0].context
+        self.scrapper.intercept = self.intercept
+        log.info(f"Browser pool ready with {self.size} contexts!")
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self.storage_state and self.contexts:
+            os.makedirs(os.path.dirname(self.storage_state), exist_ok=True)
+            await self.contexts[0].context.storage_state(path=self.storage_state)
+            log.debug(f"Saved storage state to {self.storage_state}")
+        for pooled in self.contexts:
+            await pooled.context.close()
+        self.contexts.clear()
+        if self.browser:
+            await self.browser.close()
+        if self._pw_ctx:
+            await self._pw_ctx.__aexit__(None, None, None)
+        log.info("Browser pool closed!")
+
+    async def _seedStorageState(self):
+        if not self.storage_state or os.path.exists(self.storage_state):
+            return
+        if not self.user_data_dir or not os.path.isdir(self.user_data_dir):
+            return
+        try:
+            profile = await self.playwright.chromium.launch_persistent_context(self.user_data_dir, channel="chrome", headless=True)
+        except Exception as e:
+            log.warning(f"Could not open {self.user_data_dir} to seed the pool's storage state: {e}")
+            return
+        try:
+            os.makedirs(os.path.dirname(self.storage_state), exist_ok=True)
+            await profile.storage_state(path=self.storage_state)
+            log.info(f"Seeded {self.storage_state} from {self.user_data_dir}")
+        finally:
+            await profile.close()
+
+    async def _newContext(self) -> BrowserContext:
+        state = self.storage_state if self.storage_state and os.path.exists(self.storage_state) else None
+        context = await self.browser.new_context(storage_state=state, no_viewport=True)
+        if self.intercept is not None:
+            await self.intercept.install(context)
+        return context
+
+    async def _healthy(self, page: Page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            return await asyncio.wait_for(page.evaluate("() => true"), self.health_timeout)
+        except Exception:
+            return False
+
+    async def _acquire(self) -> tuple[PooledContext, Page]:
+        async with self._lock:
+            pooled = min(self.contexts, key=lambda c: c.leased)
+            pooled.leased += 1
+            page = pooled.idle.pop() if pooled.idle else None
+
+        try:
+            if page is not None and not await self._healthy(page):
+                log.debug("Replacing unhealthy pooled page")
+                if not page.is_closed():
+                    await page.close()
+                page = None
+
+            if page is None:
+                try:
+                    page = await pooled.context.new_page()
+                except Exception as e:
+                    log.warning("Pooled context is unhealthy, recreating it", exc_info=e)
+                    pooled.idle.clear()
+                    with suppress(Exception):
+                        await pooled.context.close()
+                    pooled.context = await self._newContext()
+                    page = await pooled.context.new_page()
+                if self.intercept is not None:
+                    await self.intercept.attach(page)
+        except BaseException:
+            pooled.leased -= 1
+            raise
+        return pooled, page
+
+    async def _release(self, pooled: PooledContext, page: Page):
+        pooled.leased -= 1
+        try:
+            # undo per-page settings a job may have changed, e.g. FacebookBetter's 5s timeout
+            page.set_default_timeout(DEFAULT_TIMEOUT)
+            page.set_default_navigation_timeout(DEFAULT_TIMEOUT)
+            await page.goto("about:blank")
+            pooled.idle.append(page)
+        except Exception as e:
+            log.debug(f"Dropping pooled page that failed to reset: {e}")
+            if not page.is_closed():
+                await page.close()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Scrapper]:
+        """Lease a warm page as a page-bound Scrapper view."""
+        async with self._slots:
+            pooled, page = await self._acquire()
+            try:
+                yield self.scrapper.bind(page)
+            finally:
+                await self._release(pooled, page)
+
+    async def runJobs(self, targets: list, concurrency: int | None = None, timeout: float | None = None) -> list:
+        """Run many targets on leased pages. See Scheduler."""
+        from .scheduler import Scheduler
+        scheduler = Scheduler(self, concurrency or self.size * self.pages_per_context, timeout)
+        for target in targets:
+            scheduler.add(target)
+        return await scheduler.run()
@@ -0,0 +1,132 @@
+import os
+import errno
+import atexit
+import shutil
+import logging
+
+log = logging.getLogger("Scrapper")
+
+# Directories Chrome rebuilds on its own; never worth copying.
+SKIP_DIRS = {
+    "Cache", "Code Cache", "GPUCache", "DawnCache", "DawnGraphiteCache", "DawnWebGPUCache", "GraphiteDawnCache",
+    "GrShaderCache", "ShaderCache", "CacheStorage", "ScriptCache", "Crashpad", "BrowserMetrics", "component_crx_cache",
+    "extensions_crx_cache", "optimization_guide_model_store", "Safe Browsing", "segmentation_platform",
+}
+# Per-process locks of the browser that last used the profile.
+SKIP_FILES = {"SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile", "RunningChromeVersion"}
+# LevelDB tables are written once and only ever deleted, so clones can share them.
+IMMUTABLE_SUFFIXES = (".ldb", ".sst")
+
+FICLONE = 0x40049409
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """Copy-on-write clone of `src` (Linux FICLONE: btrfs, XFS, bcachefs)."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.EBADF, errno.EPERM):
+                return False
+            raise
+    shutil.copystat(src, dst)
+    return True
+
+
+class ProfileManager:
+    """
+    Cheap per-worker copies of a warm, logged-in template profile.
+
+    Chrome locks a user_data_dir, so parallel persistent contexts each need
+    their own. clone() builds one under `root`: LevelDB tables are hardlinked,
+    every other file is reflinked where the filesystem supports it and copied
+    otherwise, and caches and lock files are skipped. Clones are removed by
+    cleanup(), on leaving the `with` block, and at interpreter exit.
+
+    The template must not be open in a browser while it is being cloned.
+
+        with ProfileManager("./chromedata") as profiles:
+            scrappers = [Scrapper(user_data_dir=profiles.clone(f"ctx-{i}")) for i in range(4)]
+    """
+
+    def __init__(self, template: str = "./chromedata", root: str = "./chromedata-clones", hardlinks: bool = True):
+        self.template = os.path.abspath(template)
+        self.root = os.path.abspath(root)
+        self.hardlinks = hardlinks
+        self.clones: dict[str, str] = {}
+        self.stats = {"linked": 0, "reflinked": 0, "copied": 0, "skipped": 0, "bytes_copied": 0}
+        self._reflink = True
+        atexit.register(self.cleanup)
+
+    def __str__(self):
+        return f"ProfileManager({self.template}, {len(self.clones)} clones)"
+
+    def __enter__(self) -> "ProfileManager":
+        return self
+
+    def __exit__(self, exc_t, exc_v, exc_tb):
+        self.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def clone(self, name: str) -> str:
+        """A fresh copy of the template named `name`; an existing clone is replaced."""
+        if not os.path.isdir(self.template):
+            raise FileNotFoundError(f"Template profile not found: {self.template}")
+        if os.path.lexists(os.path.join(self.template, "SingletonLock")):
+            log.warning(f"{self.template} looks open in a browser; its clone may be inconsistent")
+
+        dst = self.path(name)
+        if os.path.exists(dst):
+            shutil.rmtree(dst)
+        for dirpath, dirnames, filenames in os.walk(self.template):
+            skipped = [d for d in dirnames if d in SKIP_DIRS]
+            self.stats["skipped"] += len(skipped)
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            target = os.path.join(dst, os.path.relpath(dirpath, self.template))
+            os.makedirs(target, exist_ok=True)
+            for filename in filenames:
+                src = os.path.join(dirpath, filename)
+                if filename in SKIP_FILES or os.path.islink(src):
+                    self.stats["skipped"] += 1
+                    continue
+                self._copyFile(src, os.path.join(target, filename))
+
+        self.clones[name] = dst
+        log.debug(f"Cloned {self.template} to {dst} ({self.stats})")
+        return dst
+
+    def _copyFile(self, src: str, dst: str):
+        if self.hardlinks and src.endswith(IMMUTABLE_SUFFIXES):
+            try:
+                os.link(src, dst)
+                self.stats["linked"] += 1
+                return
+            except OSError:
+                pass
+        if self._reflink:
+            if _reflink(src, dst):
+                self.stats["reflinked"] += 1
+                return
+            # one unsupported file means the filesystem has no reflinks
+            self._reflink = False
+        shutil.copy2(src, dst)
+        self.stats["copied"] += 1
+        self.stats["bytes_copied"] += os.path.getsize(dst)
+
+    def remove(self, name: str):
+        path = self.clones.pop(name, None)
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def cleanup(self):
+        """Delete every clone made by this manager."""
+        for name in list(self.clones):
+            self.remove(name)
+        if os.path.isdir(self.root) and not os.listdir(self.root):
+            os.rmdir(self.root)
@@ -0,0 +1,76 @@
+# Compiled scripts keyed by query shape; the values (paths, attribute names)
+# travel as evaluate arguments, so one script serves every query of a shape.
+_compiled: dict[tuple, str] = {}
+
+_READS = {
+    "text": "el ? el.innerText : null",
+    "attr": "el ? el.getAttribute(a.attribute) : null",
+    "exists": "!!el",
+    "count": "el ? el.children.length : 0",
+}
+
+
+class Query:
+    """
+    A batch of DOM reads relative to one root element, run by Scrapper.query()
+    in a single evaluate call and returned as a dict keyed by name.
+
+    Each read locates its element from the root by going `up` ancestors, then
+    down the child-index `path`, then to the first descendant whose
+    `search=(attribute, value)` matches; each step is optional.
+
+        q = Query().text("name", search=("data-ad-rendering-role", "profile_name"))
+                   .attr("url", "href", path=[1, 0, 1])
+                   .count("buttons", up=2)
+    """
+
+    def __init__(self):
+        self.reads: list[dict] = []
+
+    def _add(self, kind: str, name: str, up: int, path: list[int] | None, search: tuple[str, str] | None, **extra):
+        self.reads.append({
+            "kind": kind, "name": name, "up": up, "path": list(path or []),
+            "search": list(search) if search else None, **extra,
+        })
+        return self
+
+    def text(self, name: str, up: int = 0, path: list[int] | None = None, search: tuple[str, str] | None = None):
+        return self._add("text", name, up, path, search)
+
+    def attr(self, name: str, attribute: str, up: int = 0, path: list[int] | None = None, search: tuple[str, str] | None = None):
+        return self._add("attr", name, up, path, search, attribute=attribute)
+
+    def exists(self, name: str, up: int = 0, path: list[int] | None = None, search: tuple[str, str] | None = None):
+        return self._add("exists", name, up, path, search)
+
+    def count(self, name: str, up: int = 0, path: list[int] | None = None, search: tuple[str, str] | None = None):
+        return self._add("count", name, up, path, search)
+
+    @property
+    def shape(self) -> tuple:
+        return tuple((r["kind"], bool(r["up"]), bool(r["path"]), r["search"] is not None) for r in self.reads)
+
+    @property
+    def args(self) -> list[dict]:
+        return self.reads
+
+    def script(self) -> str:
+        shape = self.shape
+        if shape not in _compiled:
+            _compiled[shape] = _compile(shape)
+        return _compiled[shape]
+
+
+def _compile(shape: tuple) -> str:
+    body = []
+    for i, (kind, up, path, search) in enumerate(shape):
+        steps = [f"const a = args[{i}];", "let el = root;"]
+        if up:
+            steps.append("for (let j = 0; j < a.up && el; j++) el = el.parentElement;")
+        if path:
+            steps.append("for (const idx of a.path) { if (!el || idx >= el.children.length) { el = null; break; } el = el.children[idx]; }")
+        if search:
+            steps.append("el = el ? el.querySelector(`[${a.search[0]}=${JSON.stringify(a.search[1])}]`) : null;")
+        steps.append(f"out[a.name] = {_READS[kind]};")
+        body.append("{ " + " ".join(steps) + " }")
+    return "([root, args]) => {\n    root = root || document.documentElement;\n    const out = {};\n    " + "\n    ".join(body) + "\n    return out;\n}"
@@ -0,0 +1,107 @@
+import json
+from collections import deque
+from typing import Any, Iterable, Iterator
+from pydantic import BaseModel
+
+POST_COLUMNS = ("post_url", "epoch", "username", "content", "reactions")
+
+_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+def _fields(item: Any) -> dict:
+    if isinstance(item, BaseModel):
+        # field values live in __dict__; skips model_dump's per-field serializer
+        return vars(item)
+    return item if isinstance(item, dict) else dict(item)
+
+
+def encodeJSONL(records: Iterable[Any]) -> str:
+    """One JSON object per line for models, dicts or PostBatch rows."""
+    return "".join(_encoder.encode(_fields(record)) + "\n" for record in records)
+
+
+def _arrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow and Parquet output need pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def postSchema():
+    pa = _arrow()
+    return pa.schema([
+        ("post_url", pa.string()),
+        ("epoch", pa.int64()),
+        ("username", pa.string()),
+        ("content", pa.string()),
+        ("reactions", pa.int64()),
+    ])
+
+
+class PostBatch:
+    """
+    Columnar store of post records: one list per field instead of one object
+    per post. With `maxlen` only the newest records are kept. Iterating yields
+    `model.model_construct(...)` objects when a model is given, dicts otherwise.
+    """
+
+    __slots__ = ("columns", "maxlen", "model")
+
+    def __init__(self, records: Iterable[Any] = (), maxlen: int | None = None, model: type[BaseModel] | None = None, columns: tuple[str, ...] = POST_COLUMNS):
+        self.columns: dict[str, deque] = {column: deque(maxlen=maxlen) for column in columns}
+        self.maxlen = maxlen
+        self.model = model
+        self.extend(records)
+
+    def __repr__(self):
+        return f"PostBatch({len(self)} records)"
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def append(self, record: Any):
+        fields = _fields(record)
+        for column, values in self.columns.items():
+            values.append(fields.get(column))
+
+    def extend(self, records: Iterable[Any]):
+        for record in records:
+            self.append(record)
+
+    def clear(self):
+        for values in self.columns.values():
+            values.clear()
+
+    def rows(self) -> Iterator[dict]:
+        names = tuple(self.columns)
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.model is None:
+            return self.rows()
+        return (self.model.model_construct(**row) for row in self.rows())
+
+    def __getitem__(self, index: int) -> Any:
+        row = {column: values[index] for column, values in self.columns.items()}
+        return self.model.model_construct(**row) if self.model is not None else row
+
+    def toJSONL(self) -> str:
+        return encodeJSONL(self.rows())
+
+    def writeJSONL(self, path: str, append: bool = True):
+        with open(path, "a" if append else "w", encoding="utf-8") as f:
+            f.write(self.toJSONL())
+
+    def toArrow(self):
+        """A pyarrow Table with one column per field (needs pyarrow)."""
+        pa = _arrow()
+        if tuple(self.columns) == POST_COLUMNS:
+            return pa.table({column: list(values) for column, values in self.columns.items()}, schema=postSchema())
+        return pa.table({column: list(values) for column, values in self.columns.items()})
+
+    def writeParquet(self, path: str, compression: str = "zstd"):
+        _arrow()
+        import pyarrow.parquet as pq
+        pq.write_table(self.toArrow(), path, compression=compression)
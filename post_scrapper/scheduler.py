@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import Literal, TYPE_CHECKING
+from .scrapper import Scrapper
+
+if TYPE_CHECKING:
+    from .pool import BrowserPool
+
+
+class Job:
+    """A target queued on a Scheduler, plus its outcome once it has run."""
+
+    def __init__(self, target, timeout: float | None = None):
+        self.target = target
+        self.timeout = timeout
+        self.status: Literal["pending", "running", "done", "failed", "cancelled", "timeout"] = "pending"
+        self.error: BaseException | None = None
+        self.started: float | None = None
+        self.finished: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def __str__(self):
+        return f"Job({self.target}, {self.status})"
+
+    @property
+    def duration(self) -> float | None:
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+    def cancel(self):
+        if self.status == "pending":
+            self.status = "cancelled"
+        elif self._task is not None:
+            self._task.cancel()
+
+
+class Scheduler:
+    """
+    Runs many targets concurrently on one Scrapper. Each job gets its own page
+    in the Scrapper's context and a page-bound Scrapper view, so targets never
+    share `Scrapper.page`. Jobs start in the order they were added, at most
+    `concurrency` at a time.
+
+    `scrapper` may also be a BrowserPool, in which case jobs run on warm leased
+    pages instead of freshly opened ones.
+    """
+
+    def __init__(self, scrapper: "Scrapper | BrowserPool", concurrency: int = 4, timeout: float | None = None):
+        self.scrapper = scrapper
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.jobs: list[Job] = []
+        self._queue: asyncio.Queue[Job] = asyncio.Queue()
+
+    def add(self, target, timeout: float | None = None) -> Job:
+        job = Job(target, timeout if timeout is not None else self.timeout)
+        self.jobs.append(job)
+        self._queue.put_nowait(job)
+        self.scrapper.log.debug(f"Queued {job}")
+        return job
+
+    def cancel(self, target):
+        for job in self.jobs:
+            if job.target is target:
+                job.cancel()
+
+    async def _runJob(self, job: Job):
+        async with self.scrapper.lease() as view:
+            await asyncio.wait_for(job.target.start(view), job.timeout)
+
+    async def _worker(self):
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if job.status == "cancelled":
+                continue
+
+            job.status = "running"
+            job.started = time.monotonic()
+            job._task = asyncio.create_task(self._runJob(job))
+            self.scrapper.log.info(f"Starting target job: {job.target}")
+            try:
+                await job._task
+                job.status = "done"
+            except asyncio.CancelledError:
+                job.status = "cancelled"
+                if asyncio.current_task().cancelling():
+                    raise
+            except asyncio.TimeoutError as e:
+                job.status = "timeout"
+                job.error = e
+                self.scrapper.log.warning(f"Target job timed out: {job.target}")
+            except Exception as e:
+                job.status = "failed"
+                job.error = e
+                self.scrapper.log.warning(f"Target job failed: {job.target}", exc_info=e)
+            finally:
+                job.finished = time.monotonic()
+            self.scrapper.log.info(f"Target job completed: {job}")
+
+    async def run(self) -> list[Job]:
+        """Run every queued job and return all jobs with their outcome."""
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        return self.jobs
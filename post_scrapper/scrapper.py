@@ -1,12 +1,24 @@
 import os
+import re
+import copy
+import types
+import fnmatch
 import logging
 import asyncio
-from patchright.async_api import async_playwright, Browser, BrowserContext, Page, Locator, ElementHandle
+from patchright.async_api import async_playwright, Browser, BrowserContext, Page, Locator, ElementHandle, JSHandle, Response, CDPSession
 import random
 import math
-from typing import Literal
+from contextlib import asynccontextmanager
+from typing import Literal, AsyncIterator, Callable, Awaitable, TYPE_CHECKING
 from bs4 import BeautifulSoup, PageElement, Tag
-import lxml.etree as etree
+from .intercept import InterceptPolicy
+from .snapshot import DomSnapshot, SNAPSHOT_JS, tagXPath
+from .handles import HandleArena, HandleStats, currentArena
+from .metrics import Metrics, SCRAPPER_PRIMITIVES, HANDLE_PRIMITIVES
+from .query import Query
+
+if TYPE_CHECKING:
+    from .pacing import ScrollPacer
 
 log = logging.getLogger("Scrapper")
 formatter = logging.Formatter('[%(asctime)s] %(name)s - %(levelname)s - %(message)s', "%H:%M:%S")
@@ -14,18 +26,70 @@ ch = logging.StreamHandler()
 ch.setFormatter(formatter)
 log.addHandler(ch)
 
+# Replays a planned [dx, dy, waitMs] trajectory inside the page and resolves
+# once the last step has landed, so a whole scroll is one CDP round-trip.
+SCROLL_PLAN_JS = """(plan) => new Promise(resolve => {
+    let i = 0;
+    const tick = () => {
+        if (i >= plan.length) return resolve([window.scrollX, window.scrollY]);
+        const [dx, dy, wait] = plan[i++];
+        window.scrollBy(dx, dy);
+        setTimeout(tick, wait);
+    };
+    tick();
+})"""
+
+# Centers `el` vertically with the same ease-out-sine trajectory scroll() plans,
+# measuring and moving in the one call.
+SCROLL_TO_JS = """(el, {duration, steps}) => new Promise(resolve => {
+    const rect = el.getBoundingClientRect();
+    const target = Math.max(rect.top + window.scrollY + rect.height / 2 - window.innerHeight / 2, 0);
+    const total = target - window.scrollY;
+    let step = 0, last = 0;
+    const tick = () => {
+        if (step >= steps) return resolve([window.scrollX, window.scrollY]);
+        step++;
+        const current = total * Math.sin((step / steps) * Math.PI / 2);
+        window.scrollBy(0, current - last + (Math.random() * 2 - 1));
+        last = current;
+        setTimeout(tick, Math.max(duration * 1000 / steps + (Math.random() * 4 - 2), 0));
+    };
+    tick();
+})"""
 
 
 class Scrapper:
-    def __init__(self, headless: bool = False, user_data_dir: str = "./chromedata", log_level=logging.INFO):
+    def __init__(
+        self,
+        headless: bool = False,
+        user_data_dir: str = "./chromedata",
+        log_level=logging.INFO,
+        intercept: InterceptPolicy | str | None = None,
+        interactive: bool = True,
+        scroll_engine: Literal["wheel", "page"] = "wheel"
+    ):
+        """
+        scroll_engine="wheel" sends every scroll step as a trusted mouse wheel
+        event, one CDP message per step. scroll_engine="page" plans the same
+        eased trajectory and plays it inside the page with window.scrollBy,
+        one CDP message per scroll.
+        """
         self.headless = headless
+        self.interactive = interactive
+        self.scroll_engine = scroll_engine
         self.user_data_dir = os.path.abspath(user_data_dir)
         self._pw_ctx = None
         self.playwright = None
         self.browser: Browser | None = None
         self.context: BrowserContext | None = None
         self.page: Page | None = None
+        self._cdp: CDPSession | None = None
+        self._snapshot: DomSnapshot | None = None
+        self.handles = HandleStats()
+        self.metrics: Metrics | None = None
         self._target = None
+        self.intercept: InterceptPolicy | None = None
+        self._intercept_init = intercept
         self.log = log
         log.setLevel(log_level)
     
@@ -48,16 +112,21 @@ class Scrapper:
         pages = self.context.pages
         self.page = pages[0] if pages else await self.context.new_page()
         self.browser = None
+        if self._intercept_init is not None:
+            await self.setIntercept(self._intercept_init)
         log.info("Stealth Scrapper ready!")
         return self
 
     async def __aexit__(self, exc_t, exc_v, exc_tb):
-        # allow manual interaction before closing: do not block event loop
-        loop = asyncio.get_running_loop()
-        prompt = "Code is finished; Press enter to exit. Type 'debug' to enable debug mode for exit: "
-        inp = await loop.run_in_executor(None, input, prompt)
-        if isinstance(inp, str) and inp.lower() == "debug":
-            log.setLevel(logging.DEBUG)
+        if self.interactive:
+            # allow manual interaction before closing: do not block event loop
+            loop = asyncio.get_running_loop()
+            prompt = "Code is finished; Press enter to exit. Type 'debug' to enable debug mode for exit: "
+            inp = await loop.run_in_executor(None, input, prompt)
+            if isinstance(inp, str) and inp.lower() == "debug":
+                log.setLevel(logging.DEBUG)
+        else:
+            await self.context.close()
         await self._pw_ctx.__aexit__(exc_t, exc_v, exc_tb)
 
         # log.debug("Exiting Scrapper context")
@@ -73,6 +142,47 @@ class Scrapper:
     async def close(self):
         await self.__aexit__(None, None, None)
 
+    async def setIntercept(self, policy: InterceptPolicy | str | None):
+        """
+        Block requests in the context by `policy` (an InterceptPolicy or a
+        preset name such as "text-only"). None removes interception.
+        """
+        if self.intercept is not None:
+            await self.intercept.uninstall(self.context)
+            self.intercept = None
+        if policy is None:
+            return
+        if isinstance(policy, str):
+            policy = InterceptPolicy.preset(policy)
+        self.intercept = policy
+        await policy.install(self.context)
+        log.debug(f"Intercepting requests with {policy}")
+
+    def onResponse(
+        self,
+        pattern: str | re.Pattern,
+        handler: Callable[[Response], Awaitable[None] | None]
+    ) -> Callable[[], None]:
+        """
+        Call `handler` for every response on this page whose URL matches
+        `pattern` (a glob or compiled regex). Returns a function that unsubscribes.
+        """
+        regex = pattern if isinstance(pattern, re.Pattern) else re.compile(fnmatch.translate(pattern))
+
+        async def listener(response: Response):
+            if not regex.match(response.url):
+                return
+            try:
+                result = handler(response)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                log.warning(f"Response handler failed for {response.url}", exc_info=e)
+
+        page = self.page
+        page.on("response", listener)
+        return lambda: page.remove_listener("response", listener)
+
     async def open(self, url):
         log.debug(f"Opening page: {url}")
         page = await self.page.goto(url)
@@ -96,9 +206,110 @@ class Scrapper:
         await self._target.start(self)
         log.info(f"Target job completed: {self._target}")
 
-    async def isHandleNull(self, handle: ElementHandle) -> ElementHandle | None:
-        is_null = await handle.evaluate("el => el === null")
-        return None if is_null else handle
+    async def runJobs(self, targets: list, concurrency: int = 4, timeout: float | None = None) -> list:
+        """Run many targets concurrently, each on its own page. See Scheduler."""
+        from .scheduler import Scheduler
+        scheduler = Scheduler(self, concurrency, timeout)
+        for target in targets:
+            scheduler.add(target)
+        return await scheduler.run()
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator["Scrapper"]:
+        """A fresh page in this Scrapper's context, closed on exit."""
+        page = await self.context.new_page()
+        try:
+            if self.intercept is not None:
+                await self.intercept.attach(page)
+            yield self.bind(page)
+        finally:
+            await page.close()
+
+    def bind(self, page: Page) -> "Scrapper":
+        """A view of this Scrapper whose primitives all act on `page`."""
+        view = copy.copy(self)
+        # instrumented methods are bound to self; point them at the view
+        for name, value in vars(self).items():
+            if isinstance(value, types.MethodType) and value.__self__ is self:
+                setattr(view, name, types.MethodType(value.__func__, view))
+        view.page = page
+        if page is not None:
+            # a pooled page belongs to one of several contexts
+            view.context = page.context
+        view._cdp = None
+        view._snapshot = None
+        view._target = None
+        if self.metrics is not None and page is not None:
+            self.metrics.instrumentPage(page)
+        return view
+
+    def enableMetrics(self, metrics: Metrics | None = None) -> Metrics:
+        """
+        Time every Scrapper primitive and page call from now on. Without this
+        the primitives run unwrapped, so disabled metrics cost nothing.
+        """
+        self.metrics = metrics or self.metrics or Metrics()
+        self.metrics.instrument(self, SCRAPPER_PRIMITIVES, "scrapper")
+        self.metrics.instrument(self, HANDLE_PRIMITIVES, "scrapper", cdp=True)
+        if self.page is not None:
+            self.metrics.instrumentPage(self.page)
+        return self.metrics
+
+    async def cdp(self) -> CDPSession:
+        """CDP session for the current page, created on first use."""
+        if self._cdp is None:
+            self._cdp = await self.context.new_cdp_session(self.page)
+            await self._cdp.send("Performance.enable")
+        return self._cdp
+
+    async def pageMetrics(self) -> dict:
+        """DOM node count and JS heap size of the current page."""
+        session = await self.cdp()
+        result = await session.send("Performance.getMetrics")
+        metrics = {m["name"]: m["value"] for m in result["metrics"]}
+        return {
+            "nodes": int(metrics.get("Nodes", 0)),
+            "js_heap_used": int(metrics.get("JSHeapUsedSize", 0)),
+            "js_heap_total": int(metrics.get("JSHeapTotalSize", 0)),
+            "listeners": int(metrics.get("JSEventListeners", 0)),
+        }
+
+    def track(self, handle):
+        """
+        Register a handle (or list of handles) created outside the Scrapper
+        primitives, so the active arena disposes it and it shows up in
+        `self.handles`.
+        """
+        if handle is None:
+            return None
+        handles = handle if isinstance(handle, list) else [handle]
+        self.handles.created += len(handles)
+        arena = currentArena.get()
+        if arena is not None:
+            for h in handles:
+                arena.track(h)
+        return handle
+
+    @asynccontextmanager
+    async def arena(self) -> AsyncIterator[HandleArena]:
+        """
+        Every handle created through this Scrapper inside the block is disposed
+        when the block exits, e.g. `async with Scrapper.arena(): ...` per post.
+        """
+        arena = HandleArena(self.handles)
+        token = currentArena.set(arena)
+        try:
+            yield arena
+        finally:
+            currentArena.reset(token)
+            await arena.dispose()
+
+    async def isHandleNull(self, handle: JSHandle) -> ElementHandle | None:
+        element = handle.as_element()
+        if element is None:
+            await handle.dispose()
+            return None
+        return self.track(element)
 
     async def getParent(self, element: ElementHandle, depth: int = 1) -> ElementHandle | None:
         parent = await element.evaluate_handle(
@@ -116,17 +327,31 @@ class Scrapper:
         return await self.isHandleNull(parent)
 
     async def getChildren(self, element: ElementHandle) -> list[ElementHandle]:  
-        return await element.query_selector_all(":scope > *")                       
+        return self.track(await element.query_selector_all(":scope > *"))
 
 
     async def traverseElement(self, element: ElementHandle, path: list[int]) -> ElementHandle | None:
-        current = element
-        for idx in path:
-            children = await current.query_selector_all(":scope > *")
-            if idx >= len(children):
-                return None
-            current = children[idx]
-        return current
+        if element is None:
+            return None
+        # one handle for the target instead of one per child at every level
+        target = await element.evaluate_handle(
+            """
+            (el, path) => {
+                let current = el;
+                for (const idx of path) {
+                    if (idx >= current.children.length) return null;
+                    current = current.children[idx];
+                }
+                return current;
+            }
+            """,
+            path
+        )
+        return await self.isHandleNull(target)
+
+    async def query(self, root: ElementHandle | None, query: Query) -> dict:
+        """Run every read in `query` relative to `root` (or the document) in one round-trip."""
+        return await self.page.evaluate(query.script(), [root, query.args])
 
     async def getText(self, element: ElementHandle) -> str:
         if element is None:
@@ -144,16 +369,70 @@ class Scrapper:
 
     async def getAttr(self, element: ElementHandle, attribute: str) -> str | None:
         return await element.evaluate(f'el => el.getAttribute("{attribute}")')
+
+    async def evaluateOn(self, element: ElementHandle, script: str, arg=None):
+        return await element.evaluate(script, arg)
+
+    async def querySelector(self, element: ElementHandle, selector: str) -> ElementHandle | None:
+        return self.track(await element.query_selector(selector))
+
+    async def isVisible(self, element: ElementHandle | None) -> bool:
+        return element is not None and await element.is_visible()
+
+    async def click(self, element: ElementHandle):
+        await element.click()
+
+    async def boundingBox(self, element: ElementHandle) -> dict | None:
+        return await element.bounding_box()
         
 
     async def currentScrollPos(self):
-        x = await self.page.evaluate('() => window.scrollX')
-        y = await self.page.evaluate('() => window.scrollY')
+        x, y = await self.page.evaluate('() => [window.scrollX, window.scrollY]')
         return x, y
 
     def _ease_out_sine(self, t: float) -> float:
         return math.sin((t * math.pi) / 2)
-    
+
+    def _scrollPlan(
+        self,
+        delta_x: float,
+        delta_y: float,
+        duration: float,
+        steps: int,
+        jitter: tuple[float, float] = (0.5, 0.5),
+        wait_jitter: float = 0.0
+    ) -> list[list[float]]:
+        """Eased [dx, dy, waitMs] steps; steps too small to matter are folded into the wait."""
+        plan = []
+        prev_dx, prev_dy = 0, 0
+        wait = 0.0
+        for i in range(1, steps + 1):
+            eased = self._ease_out_sine(i / steps)
+            target_dx = delta_x * eased
+            target_dy = delta_y * eased
+
+            move_dx = target_dx - prev_dx + random.uniform(-jitter[0], jitter[0])
+            move_dy = target_dy - prev_dy + random.uniform(-jitter[1], jitter[1])
+            wait += max(duration / steps + random.uniform(-wait_jitter, wait_jitter), 0) * 1000
+
+            if abs(move_dx) > 0.1 or abs(move_dy) > 0.1:
+                plan.append([move_dx, move_dy, wait])
+                wait = 0.0
+            elif plan:
+                plan[-1][2] += wait
+                wait = 0.0
+
+            prev_dx = target_dx
+            prev_dy = target_dy
+        return plan
+
+    async def _playScroll(self, plan: list[list[float]]):
+        if self.scroll_engine == "page":
+            return await self.page.evaluate(SCROLL_PLAN_JS, plan)
+        for move_dx, move_dy, wait in plan:
+            await self.page.mouse.wheel(move_dx, move_dy)
+            await asyncio.sleep(wait / 1000)
+
     async def scroll(
         self,
         delta_x: int,
@@ -169,33 +448,29 @@ class Scrapper:
             delta_y += random.randint(-10, 10)
             log.debug(f"Randomized mouse move delta_x: {delta_x}, delta_y: {delta_y}")
 
-        cX, cY = await self.currentScrollPos()
-        log.debug(f"Scrolling mouse to delta_x: {delta_x}, delta_y: {delta_y}. Current scroll position X: {cX}, Y: {cY}")
+        # position reads are extra round-trips, only worth it when they get logged
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            cX, cY = await self.currentScrollPos()
+            log.debug(f"Scrolling ({self.scroll_engine}) to delta_x: {delta_x}, delta_y: {delta_y}. Current scroll position X: {cX}, Y: {cY}")
 
-        # Precompute eased deltas
-        eased_steps = [self._ease_out_sine(i / steps) for i in range(1, steps + 1)]
-        prev_dx, prev_dy = 0, 0
-
-        for eased in eased_steps:
-            target_dx = delta_x * eased
-            target_dy = delta_y * eased
+        await self._playScroll(self._scrollPlan(delta_x, delta_y, duration, steps))
 
-            move_dx = target_dx - prev_dx + random.uniform(-0.5, 0.5)
-            move_dy = target_dy - prev_dy + random.uniform(-0.5, 0.5)
+        if debug:
+            cX, cY = await self.currentScrollPos()
+            log.debug(f"Scrolled ({self.scroll_engine}) to delta_x: {delta_x}, delta_y: {delta_y}. New scroll position X: {cX}, Y: {cY}")
 
-            # Only scroll if movement is meaningful
-            if abs(move_dx) > 0.1 or abs(move_dy) > 0.1:
-                await self.page.mouse.wheel(move_dx, move_dy)
- 
-            prev_dx = target_dx
-            prev_dy = target_dy
+    async def html(self) -> str:
+        """Serialized snapshot of the current page DOM."""
+        return await self.page.content()
 
-            await asyncio.sleep(duration / steps)
-        cX, cY = await self.currentScrollPos()
-        log.debug(f"Scrolled mouse to delta_x: {delta_x}, delta_y: {delta_y}. New scroll position X: {cX}, Y: {cY}")
+    def pacer(self, **kwargs) -> "ScrollPacer":
+        """Adaptive scroll pacer for this page. See ScrollPacer."""
+        from .pacing import ScrollPacer
+        return ScrollPacer(self, **kwargs)
 
     async def soup(self, type = "html.parser") -> BeautifulSoup:
-        return BeautifulSoup(await self.page.content(), type)
+        return BeautifulSoup(await self.html(), type)
 
     # async def attribSearch(self, root: PageElement, attribute: str, value: str) -> PageElement | None:
     #     if hasattr(root, 'get') and root.get(attribute) == value:
@@ -212,52 +487,31 @@ class Scrapper:
 
         return None
     
+    async def snapshot(self) -> DomSnapshot:
+        """
+        Parsed snapshot of the current page. Reused as long as the page's DOM
+        hasn't changed, so many tags can be resolved against one parse.
+        """
+        known = self._snapshot.version if self._snapshot else None
+        result = await self.page.evaluate(SNAPSHOT_JS, known)
+        if "html" in result:
+            log.debug(f"DOM changed ({known} -> {result['version']}), parsing new snapshot")
+            self._snapshot = DomSnapshot(result["html"], result["version"])
+        return self._snapshot
+
     async def convertTag(self, tag: Tag) -> Locator:
-        log.debug(f"Converting tag: {tag.name}")
-        path = []
-        while tag is not None and tag.name != '[document]':
-            siblings = [sib for sib in tag.parent.find_all(tag.name, recursive=False)]
-            if len(siblings) == 1:
-                idx = ''
-            else:
-                idx = f'[{siblings.index(tag)+1}]'
-            path.insert(0, f'/{tag.name}{idx}')
-            tag = tag.parent
-
-        path = '.' + ''.join(path)
+        path = '.' + tagXPath(tag)
         log.debug(f"Converted tag {tag.name} -> '{path}'")
         return self.page.locator(f'xpath={path}')
-    
 
     async def updateTag(self, tag):
         """Given a BeautifulSoup tag, return the updated version of it from fresh soup using XPath."""
+        return (await self.updateTags([tag]))[0]
 
-        def get_xpath(tag):
-            elements = []
-            current = tag
-            while current and current.name and current.name != '[document]':
-                siblings = current.find_previous_siblings(current.name)
-                index = len(siblings) + 1
-                elements.insert(0, f"{current.name}[{index}]")
-                current = current.parent
-            return "/" + "/".join(elements)
-
-        def get_tag_by_xpath(soup, xpath):
-            try:
-                dom = etree.HTML(str(soup))
-                element = dom.xpath(xpath)
-                if element:
-                    html_str = etree.tostring(element[0], encoding='unicode')
-                    return BeautifulSoup(html_str, "html.parser").find()
-            except Exception as e:
-                log.error("XPath error:", e)
-            return None
-
-        xpath = get_xpath(tag)
-        # print("Fixed XPath:", xpath)  # Debug
-
-        soup = await self.soup()
-        return get_tag_by_xpath(soup, xpath)
+    async def updateTags(self, tags: list) -> list:
+        """updateTag for many tags against a single snapshot."""
+        snapshot = await self.snapshot()
+        return [snapshot.toTag(element) for element in snapshot.resolve(tags)]
 
 
     # async def scrollTo(self, element: Locator | Tag, padding: int = 100, max_duration: float = 3.0, step_delay=0.016):
@@ -313,8 +567,12 @@ class Scrapper:
         if isinstance(element, Tag):
             element = await self.convertTag(element)
 
+        if self.scroll_engine == "page":
+            await self.evaluateOn(element, SCROLL_TO_JS, {"duration": duration, "steps": steps})
+            return
+
         # Get element position relative to the document and viewport height
-        box = await element.evaluate("""(el) => {
+        box = await self.evaluateOn(element, """(el) => {
             const rect = el.getBoundingClientRect();
             return {
                 top: rect.top + window.scrollY,
@@ -338,20 +596,4 @@ class Scrapper:
 
         total_delta_y = target_scroll_y - current_scroll_y
 
-        last_dy = 0
-
-        for step in range(1, steps + 1):
-            t = step / steps
-            eased = self._ease_out_sine(t)
-
-            current_dy = total_delta_y * eased
-
-            move_dy = current_dy - last_dy + random.uniform(-1, 1)
-            move_dx = 0  # No horizontal scroll here, but you can add if needed
-
-            await self.page.mouse.wheel(move_dx, move_dy)
-
-            last_dy = current_dy
-
-            await asyncio.sleep(duration / steps + random.uniform(-0.002, 0.002))
-
+        await self._playScroll(self._scrollPlan(0, total_delta_y, duration, steps, jitter=(0, 1), wait_jitter=0.002))
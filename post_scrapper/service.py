@@ -0,0 +1,252 @@
+import json
+import time
+import signal
+import asyncio
+import itertools
+from typing import Any, AsyncIterator, Callable
+from pydantic import BaseModel
+from .scrapper import log
+from .scheduler import Job
+
+
+def _facebook(**params):
+    from .targets.facebookPosts import FacebookBetter
+    return FacebookBetter(**params)
+
+
+def _detection(**params):
+    from .targets.detection_check import detectionCheck
+    return detectionCheck(**params)
+
+
+# Target name -> factory taking the job's parameters
+TARGETS: dict[str, Callable[..., Any]] = {
+    "facebook": _facebook,
+    "detection": _detection,
+}
+
+
+def register(name: str, factory: Callable[..., Any]):
+    TARGETS[name] = factory
+
+
+def _encode(item: Any) -> bytes:
+    if isinstance(item, BaseModel):
+        item = item.model_dump()
+    return (json.dumps(item, ensure_ascii=False) + "\n").encode()
+
+
+class ScrapeService:
+    """
+    Long-running job server on a warm browser.
+
+    Jobs are submitted as `POST /jobs` with a JSON body
+    `{"target": "facebook", "params": {...}, "timeout": 60}` and run on a page
+    leased from `source` (a BrowserPool or a Scrapper). The response streams
+    newline-delimited JSON: a "started" event, one "post" event per post the
+    target emits, and a final "done" event. `GET /health` reports load and
+    `POST /shutdown` (or SIGTERM/SIGINT) stops the service.
+
+    Listens on a Unix socket when `socket_path` is given, otherwise on host:port.
+    """
+
+    def __init__(
+        self,
+        source,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        socket_path: str | None = None,
+        concurrency: int = 8
+    ):
+        self.source = source
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.concurrency = concurrency
+        self.running = 0
+        self.completed = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._ids = itertools.count(1)
+        self._stop = asyncio.Event()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def serve(self):
+        if self.socket_path:
+            self._server = await asyncio.start_unix_server(self._handle, self.socket_path)
+            where = self.socket_path
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            where = f"http://{self.host}:{self._server.sockets[0].getsockname()[1]}"
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self._stop.set)
+        log.info(f"Scrape service listening on {where}")
+        try:
+            await self._stop.wait()
+        finally:
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(sig)
+            self._server.close()
+            await self._server.wait_closed()
+            log.info("Scrape service stopped")
+
+    def stop(self):
+        self._stop.set()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, body: Any):
+        data = _encode(body)
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, _ = (await reader.readline()).decode().split(" ", 2)
+            length = 0
+            while (line := (await reader.readline()).strip()):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            body = json.loads(await reader.readexactly(length)) if length else {}
+
+            if method == "GET" and path == "/health":
+                await self._respond(writer, "200 OK", {
+                    "running": self.running, "completed": self.completed, "concurrency": self.concurrency,
+                })
+            elif method == "POST" and path == "/shutdown":
+                await self._respond(writer, "200 OK", {"stopping": True})
+                self.stop()
+            elif method == "POST" and path == "/jobs":
+                # everything that can reject the job happens before the streamed 200
+                try:
+                    if not isinstance(body, dict):
+                        raise ValueError("job must be a JSON object")
+                    instance = self.build(body.get("target"), body.get("params"))
+                except (TypeError, ValueError) as e:
+                    await self._respond(writer, "400 Bad Request", {"error": str(e)})
+                else:
+                    await self._stream(writer, self.events(instance, body.get("timeout")))
+            else:
+                await self._respond(writer, "404 Not Found", {"error": "not found"})
+        except (ValueError, json.JSONDecodeError, asyncio.IncompleteReadError) as e:
+            await self._respond(writer, "400 Bad Request", {"error": str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter, events: AsyncIterator[dict]):
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n"
+        )
+
+        async def send(event: dict):
+            data = _encode(event)
+            writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            await writer.drain()
+
+        async for event in events:
+            await send(event)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    def build(self, target: str, params: dict | None = None):
+        """
+        The target instance for a job. Raises ValueError for an unknown target
+        or non-object params and TypeError for params the target doesn't take.
+        """
+        if target not in TARGETS:
+            raise ValueError(f"unknown target {target!r}")
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            raise ValueError("params must be a JSON object")
+        return TARGETS[target](**params)
+
+    async def run(self, target: str, params: dict | None = None, timeout: float | None = None) -> AsyncIterator[dict]:
+        """Run one job and yield its events; also usable in-process without HTTP."""
+        async for event in self.events(self.build(target, params), timeout):
+            yield event
+
+    async def events(self, instance, timeout: float | None = None) -> AsyncIterator[dict]:
+        """Run an already built target and yield its events."""
+        jobId = next(self._ids)
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def onPost(post):
+            events.put_nowait({"event": "post", "job": jobId, "post": post.model_dump()})
+
+        if hasattr(instance, "on_post"):
+            instance.on_post = onPost
+        job = Job(instance, timeout)
+
+        async def execute():
+            async with self._slots:
+                self.running += 1
+                job.status = "running"
+                job.started = time.monotonic()
+                events.put_nowait({"event": "started", "job": jobId, "target": str(instance)})
+                try:
+                    async with self.source.lease() as view:
+                        await asyncio.wait_for(instance.start(view), timeout)
+                    job.status = "done"
+                except asyncio.TimeoutError as e:
+                    job.status, job.error = "timeout", e
+                except Exception as e:
+                    job.status, job.error = "failed", e
+                    log.warning(f"Service job {jobId} failed", exc_info=e)
+                finally:
+                    job.finished = time.monotonic()
+                    self.running -= 1
+                    self.completed += 1
+                    events.put_nowait(None)
+
+        task = asyncio.create_task(execute())
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            yield {
+                "event": "done", "job": jobId, "status": job.status, "seconds": job.duration,
+                "error": repr(job.error) if job.error else None,
+            }
+        finally:
+            if not task.done():
+                task.cancel()
+
+
+async def submitJob(
+    target: str,
+    params: dict | None = None,
+    timeout: float | None = None,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: str | None = None
+) -> AsyncIterator[dict]:
+    """Client for ScrapeService: submit a job and yield its streamed events."""
+    if socket_path:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps({"target": target, "params": params or {}, "timeout": timeout}).encode()
+    writer.write(
+        f"POST /jobs HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    try:
+        status = (await reader.readline()).decode()
+        while (await reader.readline()).strip():
+            pass
+        if " 200 " not in status:
+            raise RuntimeError(f"Job rejected: {status.strip()} {(await reader.read()).decode().strip()}")
+        while True:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            if size == 0:
+                break
+            chunk = await reader.readexactly(size + 2)
+            yield json.loads(chunk[:-2])
+    finally:
+        writer.close()
@@ -0,0 +1,222 @@
+import sqlite3
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
+from pydantic import BaseModel
+from .records import PostBatch, encodeJSONL, postSchema
+
+log = logging.getLogger("Scrapper")
+
+
+def _toDict(item: Any) -> dict:
+    if isinstance(item, BaseModel):
+        return item.model_dump()
+    return dict(item)
+
+
+class Sink(ABC):
+    """
+    Bounded, batched output for scraped records.
+
+    put() only enqueues; a background task collects up to `batch_size` items (or
+    whatever arrived within `flush_interval` seconds) and hands them to write()
+    on a dedicated thread, so slow storage never runs on the event loop. When
+    the queue is full, policy="block" makes put() wait and policy="drop-oldest"
+    discards the oldest queued item.
+
+    A sink can be passed directly as a target's on_post callback.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        policy: Literal["block", "drop-oldest"] = "block"
+    ):
+        if policy not in ("block", "drop-oldest"):
+            raise ValueError(f"Unknown backpressure policy: {policy}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.policy = policy
+        self.written = 0
+        self.dropped = 0
+        self._queue: asyncio.Queue | None = None
+        self._max_queue = max_queue
+        self._task: asyncio.Task | None = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=type(self).__name__)
+
+    def __str__(self):
+        return f"{type(self).__name__}(written={self.written}, dropped={self.dropped})"
+
+    async def __aenter__(self) -> "Sink":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        await self.close()
+
+    async def __call__(self, item: Any):
+        await self.put(item)
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue(self._max_queue)
+        await self._run(self.open)
+        self._task = asyncio.create_task(self._writer())
+
+    async def put(self, item: Any):
+        if self._task is None:
+            await self.start()
+        if self.policy == "drop-oldest":
+            while self._queue.full():
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+            self._queue.put_nowait(item)
+        else:
+            await self._queue.put(item)
+
+    async def flush(self):
+        """Wait until everything queued so far has been written."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self):
+        if self._task is None:
+            return
+        await self.flush()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self._run(self.closeStorage)
+        self._executor.shutdown(wait=True)
+        log.debug(f"Closed {self}")
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._run(self.write, batch)
+                self.written += len(batch)
+            except Exception as e:
+                log.warning(f"{type(self).__name__} failed to write {len(batch)} records", exc_info=e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    # Storage hooks, all called on the sink's own thread.
+
+    def open(self):
+        pass
+
+    @abstractmethod
+    def write(self, batch: list):
+        ...
+
+    def closeStorage(self):
+        pass
+
+
+class JSONLSink(Sink):
+    """Appends one JSON object per record to `path`."""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._file = None
+
+    def open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, batch: list):
+        self._file.write(encodeJSONL(batch))
+        self._file.flush()
+
+    def closeStorage(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class SQLiteSink(Sink):
+    """Inserts records into `table` in `path`, one transaction per batch."""
+
+    COLUMNS = ["post_url", "epoch", "username", "content", "reactions"]
+
+    def __init__(self, path: str, table: str = "posts", **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.table = table
+        self._db: sqlite3.Connection | None = None
+
+    def open(self):
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "post_url TEXT, epoch INTEGER, username TEXT, content TEXT, reactions INTEGER)"
+        )
+        self._db.commit()
+
+    def write(self, batch: list):
+        rows = []
+        for item in batch:
+            record = _toDict(item)
+            rows.append(tuple(record.get(column) for column in self.COLUMNS))
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self._db:
+            self._db.executemany(
+                f"INSERT INTO {self.table} ({', '.join(self.COLUMNS)}) VALUES ({placeholders})", rows
+            )
+
+    def closeStorage(self):
+        if self._db:
+            self._db.close()
+            self._db = None
+
+
+class ParquetSink(Sink):
+    """
+    Writes records to a Parquet file at `path`, one row group per batch.
+    Needs pyarrow; the file is complete once the sink is closed.
+    """
+
+    def __init__(self, path: str, compression: str = "zstd", **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.compression = compression
+        self._parquet = None
+
+    def open(self):
+        schema = postSchema()
+        import pyarrow.parquet as pq
+        self._parquet = pq.ParquetWriter(self.path, schema, compression=self.compression)
+
+    def write(self, batch: list):
+        self._parquet.write_table(PostBatch(batch).toArrow())
+
+    def closeStorage(self):
+        if self._parquet:
+            self._parquet.close()
+            self._parquet = None
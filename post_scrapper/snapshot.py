@@ -0,0 +1,72 @@
+import copy
+from bs4 import BeautifulSoup, Tag
+
+# Returns the page's DOM version and, only when it differs from `known`, the
+# serialized document. A MutationObserver bumps the version on every change;
+# the random document id makes versions from different navigations distinct.
+SNAPSHOT_JS = """
+(known) => {
+    if (!window.__msDomVersion) {
+        const state = {doc: Math.random().toString(36).slice(2), n: 0};
+        new MutationObserver(() => { state.n++; }).observe(document, {
+            childList: true, subtree: true, attributes: true, characterData: true,
+        });
+        window.__msDomVersion = state;
+    }
+    const version = window.__msDomVersion.doc + ":" + window.__msDomVersion.n;
+    if (version === known) return {version: version};
+    const doctype = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : "";
+    return {version: version, html: doctype + document.documentElement.outerHTML};
+}
+"""
+
+
+def tagXPath(tag: Tag) -> str:
+    """Absolute, fully indexed XPath of a BeautifulSoup tag, e.g. /html[1]/body[1]/div[3]."""
+    elements = []
+    current = tag
+    while current is not None and current.name and current.name != '[document]':
+        index = 1 + sum(1 for sibling in current.previous_siblings if getattr(sibling, "name", None) == current.name)
+        elements.append(f"{current.name}[{index}]")
+        current = current.parent
+    return "/" + "/".join(reversed(elements))
+
+
+class DomSnapshot:
+    """
+    One parse of a page, reused for every lookup until the page's DOM version
+    changes. Each XPath is looked up once and cached.
+
+    Tags are located by their tagXPath in an html.parser soup, so the snapshot
+    is parsed with html.parser too and walked directly; another parser would
+    repair invalid nesting differently and shift the indexes.
+    """
+
+    def __init__(self, html: str, version: str | None = None):
+        self.version = version
+        self.soup = BeautifulSoup(html, "html.parser")
+        self._found: dict[str, Tag | None] = {}
+
+    def __str__(self):
+        return f"DomSnapshot({self.version})"
+
+    def find(self, xpath: str) -> Tag | None:
+        """The tag at an absolute, fully indexed XPath as built by tagXPath."""
+        if xpath not in self._found:
+            current = self.soup
+            for step in xpath.strip("/").split("/"):
+                name, _, index = step.rstrip("]").partition("[")
+                matches = current.find_all(name, recursive=False)
+                current = matches[int(index) - 1] if int(index) <= len(matches) else None
+                if current is None:
+                    break
+            self._found[xpath] = current
+        return self._found[xpath]
+
+    def resolve(self, tags: list[Tag]) -> list:
+        """The snapshot tag matching each BeautifulSoup tag, or None."""
+        return [self.find(tagXPath(tag)) for tag in tags]
+
+    def toTag(self, element: Tag | None) -> Tag | None:
+        # a detached copy, so callers can't alter the cached snapshot
+        return copy.copy(element) if element is not None else None
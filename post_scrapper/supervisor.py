@@ -0,0 +1,222 @@
+import os
+import sys
+import queue
+import asyncio
+import logging
+import inspect
+import multiprocessing as mp
+from typing import Callable, Awaitable, Any
+from .scrapper import log
+from .dedupe import PostIndex
+from .profiles import ProfileManager
+
+
+def _nextProfile(wid: int, shards: list) -> str | None:
+    """Take from this worker's own shard first, then steal from the others."""
+    order = [wid] + [i for i in range(len(shards)) if i != wid]
+    for i in order:
+        try:
+            return shards[i].get_nowait()
+        except queue.Empty:
+            continue
+    return None
+
+
+def _browserLost(s, error: Exception) -> bool:
+    """True when `error` means this worker's browser or page is gone for good."""
+    if type(error).__name__ == "TargetClosedError" or "has been closed" in str(error):
+        return True
+    try:
+        return s.page is None or s.page.is_closed()
+    except Exception:
+        return True
+
+
+async def _workerLoop(wid: int, shards: list, results, params: dict, user_data_dir: str, headless: bool, profile_timeout: float | None):
+    from .scrapper import Scrapper
+    from .targets.facebookPosts import FacebookBetter
+
+    async with Scrapper(headless=headless, user_data_dir=user_data_dir, log_level=logging.WARNING, interactive=False) as s:
+        while (profile := _nextProfile(wid, shards)) is not None:
+            results.put(("started", wid, profile))
+            fb = FacebookBetter(profile, on_post=lambda post: results.put(("post", wid, post.model_dump())), **params)
+            status = "done"
+            try:
+                await s.setJob(fb)
+                await asyncio.wait_for(s.start(), profile_timeout)
+            except asyncio.TimeoutError:
+                log.warning(f"Worker {wid} gave up on {profile} after {profile_timeout:.0f}s")
+                status = "timeout"
+            except Exception as e:
+                if _browserLost(s, e):
+                    # every later profile would fail too; exit so the supervisor requeues and restarts
+                    log.warning(f"Worker {wid} lost its browser on {profile}", exc_info=e)
+                    raise
+                log.warning(f"Worker {wid} failed on {profile}", exc_info=e)
+                status = "failed"
+            results.put(("done", wid, profile, status))
+
+
+def _workerMain(wid: int, shards: list, results, params: dict, user_data_dir: str, headless: bool, profile_timeout: float | None):
+    try:
+        asyncio.run(_workerLoop(wid, shards, results, params, user_data_dir, headless, profile_timeout))
+    except Exception:
+        sys.exit(1)
+    results.put(("exit", wid))
+
+
+class Supervisor:
+    """
+    Scrapes many profiles with N worker processes, each with its own browser
+    and user_data_dir, so parsing and validation spread across cores.
+
+    Profiles are sharded round-robin; a worker that runs out steals from the
+    other shards. A worker that dies, or whose browser crashes, is restarted (up to `max_restarts` times
+    in total) and the profile it was working on is queued again. Posts from all
+    workers are deduped globally and passed to `on_post` in this process.
+    A profile still running after `profile_timeout` seconds is cut off and
+    reported as "timeout".
+
+    With a `template` profile (a path or ProfileManager), each worker runs on a
+    cheap clone of it under `user_data_root`, so every worker starts logged in.
+    Clones are removed when run() returns.
+    """
+
+    def __init__(
+        self,
+        profiles: list[str],
+        workers: int | None = None,
+        on_post: Callable[[Any], Awaitable[None] | None] | None = None,
+        params: dict | None = None,
+        user_data_root: str = "./chromedata-workers",
+        headless: bool = True,
+        max_restarts: int = 10,
+        profile_timeout: float | None = 600.0,
+        template: str | ProfileManager | None = None
+    ):
+        self.profiles = profiles
+        self.workers = workers or os.cpu_count() or 1
+        self.on_post = on_post
+        self.params = params or {}
+        self.user_data_root = os.path.abspath(user_data_root)
+        self.headless = headless
+        self.max_restarts = max_restarts
+        self.profile_timeout = profile_timeout
+        if isinstance(template, str):
+            template = ProfileManager(template, self.user_data_root)
+        self.template = template
+        self.index = PostIndex(max_size=1_000_000)
+        self.restarts = 0
+        self.emitted = 0
+        self.duplicates = 0
+        self.outcomes: dict[str, str] = {}
+
+        self._mp = mp.get_context("spawn")
+        self._shards = [self._mp.Queue() for _ in range(self.workers)]
+        self._results = self._mp.Queue()
+        self._procs: dict[int, mp.Process] = {}
+        self._current: dict[int, str | None] = {}
+        self._exited: set[int] = set()
+
+    def userDataDir(self, wid: int) -> str:
+        if self.template is not None:
+            # a restarted worker gets a fresh clone instead of the crashed browser's leftovers
+            return self.template.clone(f"worker-{wid}")
+        return os.path.join(self.user_data_root, f"worker-{wid}")
+
+    async def _spawn(self, wid: int):
+        # cloning the template is disk-bound; keep it off the event loop
+        user_data_dir = await asyncio.get_running_loop().run_in_executor(None, self.userDataDir, wid)
+        proc = self._mp.Process(
+            target=_workerMain,
+            args=(wid, self._shards, self._results, self.params, user_data_dir, self.headless, self.profile_timeout),
+            name=f"scrapper-worker-{wid}",
+            daemon=True,
+        )
+        proc.start()
+        self._procs[wid] = proc
+        self._current[wid] = None
+        log.debug(f"Started worker {wid} (pid {proc.pid})")
+
+    async def _emit(self, record: dict):
+        from .targets.facebookPosts import Post
+        post = Post.model_construct(**record)
+        if self.index.contains(post.username, post.content, post.post_url):
+            self.duplicates += 1
+            return
+        self.index.add(post.username, post.content, post.post_url)
+        self.emitted += 1
+        if self.on_post:
+            result = self.on_post(post)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _checkWorkers(self):
+        for wid, proc in list(self._procs.items()):
+            if wid in self._exited or proc.is_alive():
+                continue
+            if proc.exitcode == 0:
+                # clean exit; its "exit" message may still be in the queue
+                self._exited.add(wid)
+                continue
+            lost = self._current.get(wid)
+            log.warning(f"Worker {wid} died (exit code {proc.exitcode}) while on {lost}")
+            if lost is not None:
+                self._shards[wid].put(lost)
+            if self.restarts < self.max_restarts:
+                self.restarts += 1
+                await self._spawn(wid)
+            else:
+                self._exited.add(wid)
+                if lost is not None:
+                    self.outcomes[lost] = "lost"
+
+    async def _handle(self, message: tuple):
+        kind, wid = message[0], message[1]
+        if kind == "post":
+            await self._emit(message[2])
+        elif kind == "started":
+            self._current[wid] = message[2]
+        elif kind == "done":
+            self._current[wid] = None
+            self.outcomes[message[2]] = message[3]
+        elif kind == "exit":
+            self._exited.add(wid)
+
+    async def run(self) -> dict[str, str]:
+        """Scrape every profile; returns profile -> "done" | "failed" | "timeout" | "lost"."""
+        for i, profile in enumerate(self.profiles):
+            self._shards[i % self.workers].put(profile)
+        try:
+            for wid in range(self.workers):
+                await self._spawn(wid)
+            await self._collect()
+        finally:
+            if self.template is not None:
+                self.template.cleanup()
+        log.info(
+            f"Supervisor finished: {len(self.outcomes)} profiles, {self.emitted} posts, "
+            f"{self.duplicates} duplicates, {self.restarts} restarts"
+        )
+        return self.outcomes
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while len(self._exited) < self.workers:
+            try:
+                message = await loop.run_in_executor(None, self._results.get, True, 1.0)
+            except queue.Empty:
+                await self._checkWorkers()
+                continue
+
+            await self._handle(message)
+            await self._checkWorkers()
+
+        for proc in self._procs.values():
+            proc.join(timeout=5)
+        # messages sent just before the last workers exited
+        while True:
+            try:
+                await self._handle(self._results.get_nowait())
+            except queue.Empty:
+                break
@@ -1,82 +1,184 @@
-from ..scrapper import Scrapper
-import inspect
+from ..scrapper import Scrapper, log
+from pydantic import BaseModel
+from contextlib import AsyncExitStack
+from abc import ABC, abstractmethod
+from patchright.async_api import Page
+import os
+import time
 import asyncio
 
-class detectionCheck():
-    def __init__(self):
-        self._pass = 0
-        self._fail = 0
-        pass
+
+class CheckResult(BaseModel):
+    check: str
+    profile: str
+    url: str
+    passed: bool
+    status: str
+    seconds: float
+    error: str | None = None
+    screenshot: str | None = None
+
+
+class Check(ABC):
+    """
+    One fingerprint site. `read` waits for the site's verdict on an opened
+    page and returns it as text; the check passes when that text is in `good`.
+    `url` can be pointed at a local stand-in page with the same result markup.
+    """
+    name = "check"
+    url = ""
+    good: tuple[str, ...] = ()
+
+    def __init__(self, url: str | None = None, timeout: float = 20.0):
+        self.url = url or self.url
+        self.timeout = timeout
 
     def __str__(self):
-        return f"detectionCheck()"
+        return f"{type(self).__name__}({self.url})"
 
-    async def start(self, Scrapper: Scrapper):
-        page = Scrapper.page
-
-        # fingerprint.com
-        await Scrapper.open("https://fingerprint.com/products/bot-detection/")
-        await page.wait_for_selector('h3[class^="HeroSection-module--botSubTitle"]', timeout=20000)
-        element = await Scrapper.page.query_selector('h3[class^="HeroSection-module--botSubTitle"]')
-        if element:
-            text = await element.text_content()
-            if text == "You are a bot":
-                print("fingerprint.com failed")
-                self._fail += 1
-            else:
-                print("fingerprint.com passed")
-                self._pass += 1
-            
-        
+    @abstractmethod
+    async def read(self, page: Page) -> str:
+        ...
 
-        # iphey.com
-        await Scrapper.open("https://iphey.com/")
+    def passed(self, status: str) -> bool:
+        return status in self.good
 
+
+class FingerprintCheck(Check):
+    name = "fingerprint.com"
+    url = "https://fingerprint.com/products/bot-detection/"
+    SELECTOR = 'h3[class^="HeroSection-module--botSubTitle"]'
+
+    async def read(self, page: Page) -> str:
+        element = await page.wait_for_selector(self.SELECTOR, timeout=self.timeout * 1000)
+        return (await element.text_content() or "").strip()
+
+    def passed(self, status: str) -> bool:
+        return status != "You are a bot"
+
+
+class IpheyCheck(Check):
+    name = "iphey.com"
+    url = "https://iphey.com/"
+    good = ("Good",)
+    STATUS_MAP = {
+        "trustworthy": "Good",
+        "suspicious": "Suspicious",
+        "unreliable": "Bot"
+    }
+
+    async def read(self, page: Page) -> str:
         await page.wait_for_function("""
             () => {
                 const loader = document.querySelector('.loader');
                 return loader && loader.classList.contains('hide');
             }
-        """, timeout=15000)
-
-
-        status_map = {
-            "trustworthy": "Good",
-            "suspicious": "Suspicious",
-            "unreliable": "Bot"
-        }
-
-        final_status = "Unknown"
-        for key, label in status_map.items():
-            locator = page.locator(f".identity-status__status.{key}")
-            if await locator.is_visible():
-                final_status = label
-                break
-        
-        if final_status == "Good":
-            print("iphey.com passed")
-            self._pass += 1
-        else:
-            print("iphey.com failed, status:", final_status)
-            self._fail += 1
-        
-
-        # browserscan.net
-        await page.goto("https://www.browserscan.net/bot-detection")
-
-        await page.wait_for_selector("strong:text('Test Results:')", timeout=15000)
-
-        robot_label = page.locator("//strong[text()='Test Results:']/following-sibling::strong[1]").first
-        text = await robot_label.text_content()
-
-        await page.screenshot(path="bot.png", full_page=True)
-
-        if text == "Normal":
-            print("browserscan.net passed")
-            self._pass += 1
-        else:
-            print("browserscan.net failed")
-            self._fail += 1
-        
-        
-        print("Bot Detection Checks:", self._pass, "pass", self._fail, "fail")
+        """, timeout=self.timeout * 1000)
+        for key, label in self.STATUS_MAP.items():
+            if await page.locator(f".identity-status__status.{key}").is_visible():
+                return label
+        return "Unknown"
+
+
+class BrowserscanCheck(Check):
+    name = "browserscan.net"
+    url = "https://www.browserscan.net/bot-detection"
+    good = ("Normal",)
+
+    async def read(self, page: Page) -> str:
+        await page.wait_for_selector("strong:text('Test Results:')", timeout=self.timeout * 1000)
+        label = page.locator("//strong[text()='Test Results:']/following-sibling::strong[1]").first
+        return (await label.text_content() or "").strip()
+
+
+CHECKS: list[type[Check]] = [FingerprintCheck, IpheyCheck, BrowserscanCheck]
+
+
+def defaultChecks(urls: dict[str, str] | None = None, timeout: float = 20.0) -> list[Check]:
+    """The built-in checks; `urls` maps check names to replacement URLs."""
+    urls = urls or {}
+    return [check(urls.get(check.name), timeout) for check in CHECKS]
+
+
+async def runCheck(source, check: Check, profile: str = "default", screenshots: str | None = None) -> CheckResult:
+    """Run one check on its own page leased from `source` (a Scrapper or BrowserPool)."""
+    start = time.monotonic()
+    status, error, shot = "", None, None
+    async with source.lease() as s:
+        try:
+            await s.open(check.url)
+            status = await check.read(s.page)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if screenshots:
+            os.makedirs(screenshots, exist_ok=True)
+            shot = os.path.join(screenshots, f"{profile}-{check.name}.png")
+            try:
+                await s.page.screenshot(path=shot, full_page=True)
+            except Exception as e:
+                log.warning(f"Screenshot of {check.name} failed: {e}")
+                shot = None
+    return CheckResult(
+        check=check.name,
+        profile=profile,
+        url=check.url,
+        passed=error is None and check.passed(status),
+        status=status,
+        seconds=time.monotonic() - start,
+        error=error,
+        screenshot=shot
+    )
+
+
+async def runSuite(profiles: dict, checks: list[Check] | None = None, screenshots: str | None = None) -> list[CheckResult]:
+    """Every check against every profile (name -> Scrapper or BrowserPool), all at once."""
+    checks = checks if checks is not None else defaultChecks()
+    return list(await asyncio.gather(*(
+        runCheck(source, check, profile, screenshots)
+        for profile, source in profiles.items()
+        for check in checks
+    )))
+
+
+async def checkProfiles(
+    user_data_dirs: list[str],
+    checks: list[Check] | None = None,
+    headless: bool = False,
+    screenshots: str | None = None
+) -> list[CheckResult]:
+    """Launch one Scrapper per profile directory and run the suite across them."""
+    async with AsyncExitStack() as stack:
+        profiles = {}
+        for user_data_dir in user_data_dirs:
+            profiles[os.path.basename(os.path.normpath(user_data_dir))] = await stack.enter_async_context(
+                Scrapper(headless=headless, user_data_dir=user_data_dir, interactive=False)
+            )
+        return await runSuite(profiles, checks, screenshots)
+
+
+class detectionCheck():
+    def __init__(self, checks: list[Check] | None = None, urls: dict[str, str] | None = None, screenshots: str | None = None, timeout: float = 20.0):
+        """
+        Runs every check concurrently, each on its own page of the Scrapper it
+        is started on. `urls` points built-in checks at stand-in pages;
+        `screenshots` is a directory to save a full-page shot of each check in.
+        """
+        self.checks = checks if checks is not None else defaultChecks(urls, timeout)
+        self.screenshots = screenshots
+        self.results: list[CheckResult] = []
+        self._pass = 0
+        self._fail = 0
+
+    def __str__(self):
+        return f"detectionCheck()"
+
+    async def start(self, Scrapper: Scrapper):
+        self.results = await runSuite({"default": Scrapper}, self.checks, self.screenshots)
+        for result in self.results:
+            if result.passed:
+                log.info(f"{result.check} passed ({result.status}, {result.seconds:.1f}s)")
+            else:
+                log.warning(f"{result.check} failed ({result.error or result.status}, {result.seconds:.1f}s)")
+        self._pass = sum(result.passed for result in self.results)
+        self._fail = len(self.results) - self._pass
+        log.info(f"Bot Detection Checks: {self._pass} pass {self._fail} fail")
@@ -0,0 +1,102 @@
+import json
+from typing import Any, Iterator
+from .facebookPosts import Post, permalink, shorthandNumber
+
+# Facebook prefixes some JSON responses with this to break <script> inclusion
+XSSI_PREFIX = "for (;;);"
+
+_decoder = json.JSONDecoder()
+
+def iterPayloads(body: str) -> Iterator[Any]:
+    """
+    Yield each JSON document in a response body. GraphQL feed responses are
+    several documents back to back (one per streamed chunk), so they are decoded
+    one at a time instead of as a whole.
+    """
+    if body.startswith(XSSI_PREFIX):
+        body = body[len(XSSI_PREFIX):]
+    pos, end = 0, len(body)
+    while pos < end:
+        while pos < end and body[pos].isspace():
+            pos += 1
+        if pos >= end:
+            break
+        try:
+            obj, pos = _decoder.raw_decode(body, pos)
+        except json.JSONDecodeError:
+            nextLine = body.find("\n", pos)
+            if nextLine == -1:
+                break
+            pos = nextLine + 1
+            continue
+        yield obj
+
+
+def _find(node: Any, key: str) -> Any:
+    """First value stored under `key` anywhere below `node` (depth first)."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if key in current:
+                return current[key]
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+    return None
+
+
+def _isStory(node: dict) -> bool:
+    return node.get("__typename") == "Story" and ("post_id" in node or "comet_sections" in node)
+
+
+def iterStories(payload: Any) -> Iterator[dict]:
+    """
+    Outermost Story nodes in a payload, in feed order; attachments nested
+    inside a story are skipped.
+    """
+    stack = [payload]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if _isStory(current):
+                yield current
+                continue
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def storyToPost(story: dict, validate: bool = True) -> Post | None:
+    actors = _find(story, "actors")
+    username = actors[0].get("name", "") if isinstance(actors, list) and actors and isinstance(actors[0], dict) else ""
+    message = _find(story, "message")
+    content = message.get("text", "") if isinstance(message, dict) else ""
+    if not username and not content:
+        return None
+
+    # only the story's own link fields; any other nested "url" is usually the actor's profile
+    url = story.get("url") or story.get("permalink_url") or _find(story, "permalink_url")
+    epoch = _find(story, "creation_time")
+    reactions = _find(story, "reaction_count")
+    if isinstance(reactions, dict):
+        reactions = reactions.get("count")
+
+    return (Post if validate else Post.model_construct)(
+        post_url=permalink(url) if isinstance(url, str) else "",
+        epoch=epoch if isinstance(epoch, int) else 0,
+        username=username,
+        content=content.replace("\n", " "),
+        reactions=shorthandNumber(reactions),
+    )
+
+
+def parseResponse(body: str, validate: bool = True) -> list[Post]:
+    """Posts contained in one GraphQL (or embedded application/json) response body."""
+    posts = []
+    for payload in iterPayloads(body):
+        for story in iterStories(payload):
+            post = storyToPost(story, validate)
+            if post is not None:
+                posts.append(post)
+    return posts
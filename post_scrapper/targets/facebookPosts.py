@@ -1,10 +1,304 @@
 from ..scrapper import Scrapper
-from datetime import datetime
+from ..dedupe import PostIndex, SeenStore, normalize, isPermalink
+from ..pacing import ScrollPacer
+from ..query import Query
+from ..records import PostBatch
+from .facebookTime import TimeResolver, toEpoch
 from pydantic import BaseModel
 from patchright.async_api import ElementHandle
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-from typing import Callable, Awaitable, Optional
+from typing import Callable, Awaitable, Optional, Literal
 import inspect
+import asyncio
+import logging
+import time
+
+# Collapse emitted posts (marked data-ms-done) that are more than `margin` px
+# above the viewport. The post keeps its box so scroll position and infinite
+# loading are unaffected. Its nodes are left in place, since React owns them
+# and removes them itself when it unmounts the post; only rendering is skipped
+# and image and video sources are dropped so their decoded data can be freed.
+PRUNE_POSTS_JS = """
+(margin) => {
+    let pruned = 0;
+    for (const post of document.querySelectorAll('[data-ms-done]:not([data-ms-pruned])')) {
+        const rect = post.getBoundingClientRect();
+        if (rect.bottom > -margin) continue;
+        post.style.height = rect.height + "px";
+        post.style.overflow = "hidden";
+        post.style.contentVisibility = "hidden";
+        for (const img of post.querySelectorAll('img[src]')) {
+            img.removeAttribute("srcset");
+            img.removeAttribute("src");
+        }
+        for (const video of post.querySelectorAll('video')) {
+            video.pause();
+            video.removeAttribute("src");
+            video.load();
+        }
+        post.setAttribute("data-ms-pruned", "");
+        pruned++;
+    }
+    return pruned;
+}
+"""
+
+# In-page helpers shared by the evaluate mode scripts, installed once per
+# document as window.__msFeed. A post is the 9th ancestor of a Like button
+# whose 2nd ancestor has at least 3 children, the same walk the "dom" mode does.
+#
+# A MutationObserver queues Like buttons as Facebook inserts them, so drain()
+# only resolves and reads posts that are new since the previous call. Buttons
+# whose post isn't fully rendered yet, or whose post has no text or time link
+# yet, are retried on the next few drains before the post is taken as it is.
+FEED_HELPERS_JS = """
+if (!window.__msFeed) window.__msFeed = (() => {
+    const LIKE = 'div[aria-label="Like"]';
+    const RETRIES = 3;
+    const parent = (el, depth) => {
+        let current = el;
+        for (let i = 0; i < depth; i++) {
+            if (!current.parentNode) return null;
+            current = current.parentNode;
+        }
+        return current;
+    };
+    const child = (el, path) => {
+        let current = el;
+        for (const idx of path) {
+            if (!current || idx >= current.children.length) return null;
+            current = current.children[idx];
+        }
+        return current;
+    };
+    const text = (el) => el ? el.innerText : "";
+    const postOf = (like) => {
+        const outer = parent(like, 2);
+        if (!outer || outer.children.length < 3) return null;
+        return parent(like, 9);
+    };
+
+    let timeId = 0;
+    const emitted = new WeakSet();
+    const prune = """ + PRUNE_POSTS_JS + """;
+    let pending = new Map();
+    const enqueue = (node) => {
+        if (node.nodeType !== Node.ELEMENT_NODE) return;
+        if (node.matches(LIKE)) pending.set(node, 0);
+        for (const like of node.querySelectorAll(LIKE)) pending.set(like, 0);
+    };
+    const observer = new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) enqueue(node);
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+
+    const expand = async (posts) => {
+        let expanded = false;
+        for (const post of posts) {
+            for (const button of post.querySelectorAll('[role="button"]')) {
+                if (button.offsetParent !== null && /see more/i.test(button.innerText)) {
+                    button.click();
+                    expanded = true;
+                }
+            }
+        }
+        if (expanded) await new Promise(r => requestAnimationFrame(() => setTimeout(r, 0)));
+    };
+
+    const extract = async (posts) => {
+        await expand(posts);
+        return posts.map((post, index) => {
+            const reel = child(post, [1]);
+            const timeTag = child(post, [1, 0, 1, 0, 1, 0, 0, 0, 0]);
+            let id = null;
+            if (timeTag) {
+                id = timeTag.getAttribute("data-ms-time");
+                if (id === null) {
+                    id = String(++timeId);
+                    timeTag.setAttribute("data-ms-time", id);
+                }
+            }
+            const link = child(timeTag, [0]);
+            return {
+                index: index,
+                username: text(post.querySelector('[data-ad-rendering-role="profile_name"]')),
+                content: text(post.querySelector('[data-ad-rendering-role="story_message"]')),
+                post_url: (link && link.getAttribute("href")) || "",
+                reactions_text: text(child(post, [3, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1])),
+                is_reel: !!reel && reel.getAttribute("aria-label") === "Open reel in Reels Viewer",
+                time_id: id,
+            };
+        });
+    };
+
+    return {
+        // every post currently in the document
+        scanAll: () => {
+            const posts = new Set();
+            for (const like of document.querySelectorAll(LIKE)) {
+                const post = postOf(like);
+                if (post) posts.add(post);
+            }
+            return extract([...posts]);
+        },
+        // only posts inserted since the last drain, optionally pruning the ones
+        // already emitted that are more than `pruneMargin` px above the viewport
+        drain: async (pruneMargin) => {
+            if (pruneMargin !== null && pruneMargin !== undefined) prune(pruneMargin);
+            const found = new Map();
+            const retry = new Map();
+            for (const [like, tries] of pending) {
+                if (!like.isConnected) continue;
+                const post = postOf(like);
+                if (post && !emitted.has(post)) {
+                    if (!found.has(post)) found.set(post, [like, tries]);
+                } else if (!post && tries < RETRIES) {
+                    retry.set(like, tries + 1);
+                }
+            }
+            const posts = [...found.keys()];
+            const records = [];
+            for (const record of await extract(posts)) {
+                const post = posts[record.index];
+                const [like, tries] = found.get(post);
+                // a post still missing its text or time link is read again next drain
+                const complete = record.is_reel || (record.content && record.time_id !== null);
+                if (!complete && tries < RETRIES) {
+                    retry.set(like, tries + 1);
+                    continue;
+                }
+                emitted.add(post);
+                post.setAttribute("data-ms-done", "");
+                records.push(record);
+            }
+            pending = retry;
+            return records;
+        },
+        seed: () => enqueue(document.body),
+        prune: prune,
+    };
+})();
+"""
+
+# Every visible post in one evaluate call.
+EXTRACT_POSTS_JS = f"""
+async () => {{
+    {FEED_HELPERS_JS}
+    return await window.__msFeed.scanAll();
+}}
+"""
+
+# Posts added since the previous call; the first call seeds the queue with
+# what is already in the document.
+DRAIN_POSTS_JS = f"""
+async (pruneMargin) => {{
+    if (!window.__msFeed) {{
+        {FEED_HELPERS_JS}
+        window.__msFeed.seed();
+    }}
+    return await window.__msFeed.drain(pruneMargin);
+}}
+"""
+
+
+# hrefs of the time links tagged data-ms-time, read again after hovering them
+TIME_HREFS_JS = """
+(ids) => ids.map(id => {
+    const timeTag = document.querySelector(`[data-ms-time="${id}"]`);
+    const link = timeTag && timeTag.children[0];
+    return (link && link.getAttribute("href")) || "";
+})
+"""
+
+# clicks "See more" inside posts only (the same Like button walk as __msFeed)
+EXPAND_SEE_MORE_JS = """
+async () => {
+    let expanded = false;
+    for (const like of document.querySelectorAll('div[aria-label="Like"]')) {
+        const outer = like.parentNode && like.parentNode.parentNode;
+        if (!outer || outer.children.length < 3) continue;
+        let post = like;
+        for (let i = 0; i < 9 && post; i++) post = post.parentNode;
+        if (!post || post.hasAttribute("data-ms-pruned")) continue;
+        for (const button of post.querySelectorAll('[role="button"]')) {
+            if (button.offsetParent !== null && /see more/i.test(button.innerText)) {
+                button.click();
+                expanded = true;
+            }
+        }
+    }
+    if (expanded) await new Promise(r => requestAnimationFrame(() => setTimeout(r, 0)));
+}
+"""
+
+EMBEDDED_JSON_JS = """
+() => Array.from(document.querySelectorAll('script[type="application/json"]'))
+    .map(s => s.textContent)
+    .filter(t => t.includes('"Story"'))
+"""
+
+# Reads the "dom" mode makes per Like button and per post, one round-trip each
+POST_CHECK = (
+    Query()
+    .count("buttons", up=2)
+    .attr("reel", "aria-label", up=9, path=[1])
+)
+POST_FIELDS = (
+    Query()
+    .text("username", search=("data-ad-rendering-role", "profile_name"))
+    .text("content", search=("data-ad-rendering-role", "story_message"))
+    .attr("url", "href", path=[1, 0, 1, 0, 1, 0, 0, 0, 0, 0])
+    .text("reactions", path=[3, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1])
+)
+# Permalink under a time link, re-read after hovering it
+TIME_LINK = Query().attr("url", "href", path=[0])
+
+# FacebookBetter steps timed when the Scrapper has metrics enabled
+STAGES = [
+    "_setLatest", "_checkSeeMore", "_getTimeTag", "_getURL", "extractPosts", "drainPosts", "_emit_post", "_advance",
+]
+
+
+def parseURL(url: str) -> str:
+    """`url` without Facebook's click-tracking query parameters."""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    filtered_query = {k: v for k, v in query.items() if not (k.startswith("__cft__") or k.startswith("__tn__"))}
+    clean_query = urlencode(filtered_query, doseq=True)
+    return urlunparse(parsed._replace(query=clean_query))
+
+
+def permalink(href: str | None) -> str:
+    """Cleaned `href` when it points at a post, else "" (un-hovered time links are placeholders)."""
+    url = parseURL(href) if href else ""
+    return url if isPermalink(url) else ""
+
+
+def shorthandNumber(value) -> int:
+    """Reaction counts like "1.2K" as integers; 0 when unreadable."""
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        s = value.strip().upper().replace(",", "")
+        if not s:
+            return 0
+        try:
+            if s.endswith("K"):
+                return int(float(s[:-1]) * 1_000)
+            elif s.endswith("M"):
+                return int(float(s[:-1]) * 1_000_000)
+            elif s.endswith("B"):
+                return int(float(s[:-1]) * 1_000_000_000)
+            else:
+                return int(float(s))
+        except ValueError:
+            pass
+    return 0
+
 
 class FacebookBetter:
     def __init__(
@@ -12,8 +306,51 @@ class FacebookBetter:
         user: str,
         mentions: bool = True,
         recent: bool = False,
-        on_post: Optional[Callable[['Post'], Awaitable[None] | None]] = None
+        on_post: Optional[Callable[['Post'], Awaitable[None] | None]] = None,
+        mode: Literal["dom", "evaluate", "snapshot", "network"] = "dom",
+        dedupe: PostIndex | None = None,
+        keep_posts: int = 1000,
+        idle_scrolls: int = 10,
+        prune: int | None = None,
+        seen_store: SeenStore | None = None,
+        stop_after_known: int = 5,
+        pacing: Literal["fixed", "adaptive"] = "fixed",
+        validate: bool = True
     ):
+        """
+        mode="dom" walks the Like buttons one post at a time, with a batched
+        Query per button and per post.
+        mode="evaluate" reads new posts in one in-page evaluate call per scroll
+        (an in-page MutationObserver queues posts as they are inserted) and
+        only goes back to the browser to hover the timestamp.
+        mode="snapshot" only scrolls and snapshots the page; posts are parsed from
+        the HTML with lxml in a process pool (see facebookSnapshot). Snapshots
+        have no timestamp tooltip, so epoch is 0.
+        mode="network" never reads the feed DOM: posts are parsed from the page's
+        embedded JSON and its GraphQL responses (see facebookGraphQL), and
+        scrolling only triggers pagination.
+        Every mode ends once `idle_scrolls` scrolls in a row bring no new post.
+
+        With `prune` set ("dom" and "evaluate" modes), emitted posts more than that
+        many pixels above the viewport are collapsed at their height: no longer
+        rendered and stripped of image and video sources, so paint and media
+        memory stay flat on long sessions. Only that memory is reclaimed: the
+        posts' DOM nodes and their JS objects stay, as React owns them, so node
+        count and JS heap still grow with the feed.
+
+        With a `seen_store`, posts emitted by earlier runs of the same profile URL
+        are loaded at start and not emitted again. With recent=True the run stops
+        once `stop_after_known` posts from earlier runs are seen in a row.
+
+        pacing="fixed" scrolls 1000px per iteration; pacing="adaptive" lets a
+        ScrollPacer pick distance and delay from network activity, new posts and
+        page growth, and ends the run at the end of the feed.
+
+        Seen posts are tracked in `dedupe` (an LRU PostIndex by default) and only
+        the last `keep_posts` emitted posts are kept in `self.posts`, a columnar
+        PostBatch. With validate=False posts are built with Post.model_construct,
+        skipping pydantic validation of fields the scraper already typed.
+        """
         self.Scrapper: Scrapper = None
         self.url = f'https://www.facebook.com/{user}'
         if mentions:
@@ -22,10 +359,23 @@ class FacebookBetter:
         self.mentions = mentions
         self.recent = recent
 
-        self.posts: list[Post] = []
-        self.postsID = set()
+        self.posts = PostBatch(maxlen=keep_posts, model=Post)
+        self.validate = validate
+        self.index = dedupe if dedupe is not None else PostIndex()
 
         self.on_post = on_post
+        self.mode = mode
+        self.idle_scrolls = idle_scrolls
+        self.prune = prune
+        self.seen_store = seen_store
+        self.stop_after_known = stop_after_known
+        self.previous = PostIndex(max_size=self.index.max_size)
+        self._knownStreak: set[str] = set()
+        self.times: TimeResolver | None = None
+        self.pacing = pacing
+        self.pacer: ScrollPacer | None = None
+        self.emitted = 0
+        self._started: float | None = None
 
     def __str__(self):
         return f"Facebook({self.url})"
@@ -33,6 +383,47 @@ class FacebookBetter:
     async def start(self, Scrapper: Scrapper):
         self.Scrapper = Scrapper
         self.page = Scrapper.page
+        self.times = TimeResolver(Scrapper)
+        if Scrapper.metrics is not None:
+            Scrapper.metrics.instrument(self, STAGES, "facebook")
+        self.pacer = Scrapper.pacer() if self.pacing == "adaptive" else None
+        self._started = time.monotonic()
+        self.emitted = 0
+        try:
+            await self._run()
+        finally:
+            if self.pacer is not None:
+                self.pacer.stop()
+            if self.seen_store is not None:
+                self.seen_store.flush()
+            Scrapper.log.info(f"{self}: {self.emitted} posts, {self.posts_per_minute:.1f} posts/min")
+
+    @property
+    def posts_per_minute(self) -> float:
+        if self._started is None:
+            return 0.0
+        elapsed = time.monotonic() - self._started
+        return self.emitted / elapsed * 60 if elapsed > 0 else 0.0
+
+    async def _advance(self, newPosts: int) -> bool:
+        """Scroll for the next batch. False once the adaptive pacer hits the end of the feed."""
+        if self.pacer is not None:
+            return await self.pacer.step(newPosts)
+        await self.Scrapper.scroll(0, 1000, duration=0.1, steps=30)
+        return True
+
+    async def _run(self):
+        Scrapper = self.Scrapper
+
+        if self.seen_store is not None:
+            keys = self.seen_store.keys(self.url, self.index.max_size)
+            self.index.addKeys(keys)
+            self.previous.addKeys(keys)
+            Scrapper.log.debug(f"Loaded {len(keys)} seen post keys for {self.url}")
+
+        if self.mode == "network":
+            await self._runNetwork()
+            return
 
         await Scrapper.open(self.url)
 
@@ -41,56 +432,270 @@ class FacebookBetter:
 
         self.page.set_default_timeout(5000)
 
-        while True:
-            try:
-                await self.page.wait_for_selector('div[aria-label="Like"]', state='attached')
-                LikeButtons = await self.page.query_selector_all('div[aria-label="Like"]')
+        if self.mode == "evaluate":
+            await self._runEvaluate()
+        elif self.mode == "snapshot":
+            await self._runSnapshot()
+        else:
+            await self._runDOM()
 
-                for i, likeButton in enumerate(LikeButtons):
-                    outerButtons = await Scrapper.getParent(likeButton, 2)
-                    if len(await Scrapper.getChildren(outerButtons)) >= 3:
-                        postDiv = await Scrapper.getParent(likeButton, 9)
+    async def _runDOM(self):
+        Scrapper = self.Scrapper
 
-                        possibleReelTag = await self.Scrapper.traverseElement(postDiv, [1])
-                        if await self.Scrapper.getAttr(possibleReelTag, 'aria-label') == 'Open reel in Reels Viewer':
-                            continue
+        idle = 0
+        while idle < self.idle_scrolls:
+            before = self.emitted
+            try:
+                async with Scrapper.arena():
+                    Scrapper.track(await self.page.wait_for_selector('div[aria-label="Like"]', state='attached'))
+                    # pruned posts were emitted already and have no media left to read
+                    LikeButtons = Scrapper.track(await self.page.query_selector_all('div[aria-label="Like"]:not([data-ms-pruned] *)'))
+
+                    for i, likeButton in enumerate(LikeButtons):
+                        async with Scrapper.arena():
+                            check = await Scrapper.query(likeButton, POST_CHECK)
+                            if check["buttons"] >= 3:
+                                if check["reel"] == 'Open reel in Reels Viewer':
+                                    continue
+
+                                postDiv = await Scrapper.getParent(likeButton, 9)
+
+                                await self._checkSeeMore(postDiv)
+
+                                fields = await Scrapper.query(postDiv, POST_FIELDS)
+                                profileName = fields["username"] or ''
+                                postContent = (fields["content"] or '').replace('\n', ' ')
+
+                                if self._isKnown(profileName, postContent):
+                                    if self._caughtUp():
+                                        return
+                                else:
+                                    timeTag = await self._getTimeTag(postDiv)
+
+                                    url = permalink(fields["url"])
+                                    epoch = await self.times.resolve(timeTag, url)
+                                    # Facebook only fills in the permalink once the time link was hovered
+                                    url = await self._getURL(timeTag)
+                                    self.times.store(url, epoch)
+                                    reactions = self._convert_shorthand_number(fields["reactions"])
+
+                                    postClass = self._newPost(
+                                        post_url=url,
+                                        epoch=epoch,
+                                        username=profileName,
+                                        content=postContent,
+                                        reactions=reactions,
+                                    )
+
+                                    self._remember(postClass)
+
+                                    await self._emit_post(postClass)
+
+                                    if self.prune is not None:
+                                        await Scrapper.evaluateOn(postDiv, "el => el.setAttribute('data-ms-done', '')")
+
+                                    break
+            except Exception as e:
+                Scrapper.log.warning("Failed to get post details", exc_info=e)
+                await Scrapper.scroll(0, 500, duration=0.1, steps=30)
+                break
 
-                        await self._checkSeeMore(postDiv)
+            if self.prune is not None:
+                await self.page.evaluate(PRUNE_POSTS_JS, self.prune)
+                await self._logMemory()
 
-                        profileName = await self._getProfileName(postDiv)
-                        postContent = await self._getPostBody(postDiv)
-                        postContent = postContent.replace('\n', ' ')
+            idle = 0 if self.emitted > before else idle + 1
+            if not await self._advance(self.emitted - before):
+                return
 
-                        if not any(self._strip(post.content) == self._strip(postContent) and
-                                   self._strip(post.username) == self._strip(profileName) for post in self.posts):
+    async def _runEvaluate(self):
+        Scrapper = self.Scrapper
 
-                            timeTag = await self._getTimeTag(postDiv)
+        try:
+            async with Scrapper.arena():
+                Scrapper.track(await self.page.wait_for_selector('div[aria-label="Like"]', state='attached'))
+        except Exception as e:
+            Scrapper.log.warning("Failed to get post details", exc_info=e)
+            return
 
-                            await Scrapper.scrollTo(timeTag, 0.05, 10)
+        idle = 0
+        while idle < self.idle_scrolls:
+            before = self.emitted
+            try:
+                async with Scrapper.arena():
+                    records = await self.drainPosts()
+                    idle = 0 if records else idle + 1
+                    if self.prune is not None:
+                        await self._logMemory()
+
+                    fresh = []
+                    for record in records:
+                        if record.is_reel or record.time_id is None:
+                            continue
+
+                        url = permalink(record.post_url)
+                        if self._isKnown(record.username, record.content, url):
+                            if self._caughtUp():
+                                return
+                            continue
 
-                            time = await self._getTime(timeTag)
-                            url = await self._getURL(timeTag)
-                            reactions = await self._getReactions(postDiv)
+                        timeTag = Scrapper.track(await self.page.query_selector(f'[data-ms-time="{record.time_id}"]'))
+                        fresh.append((record, timeTag, url))
 
-                            postClass = Post(
-                                post_url=url,
-                                epoch=time,
-                                username=profileName,
-                                content=postContent,
-                                reactions=reactions,
-                            )
+                    # every tooltip visible from the current scroll position is read before scrolling
+                    times = await self.times.resolveMany([(timeTag, url) for _, timeTag, url in fresh])
+                    # Facebook only fills in the permalinks once the time links were hovered
+                    hrefs = await self.page.evaluate(TIME_HREFS_JS, [record.time_id for record, _, _ in fresh]) if fresh else []
 
-                            self.posts.append(postClass)
+                    for (record, _, _), epoch, href in zip(fresh, times, hrefs):
+                        url = permalink(href)
+                        self.times.store(url, epoch)
+                        postClass = self._newPost(
+                            post_url=url,
+                            epoch=epoch,
+                            username=record.username,
+                            content=record.content,
+                            reactions=self._convert_shorthand_number(record.reactions_text),
+                        )
 
-                            await self._emit_post(postClass)
+                        self._remember(postClass)
 
-                            break
+                        await self._emit_post(postClass)
             except Exception as e:
                 Scrapper.log.warning("Failed to get post details", exc_info=e)
                 await Scrapper.scroll(0, 500, duration=0.1, steps=30)
                 break
 
-            await Scrapper.scroll(0, 1000, duration=0.1, steps=30)
+            if not await self._advance(self.emitted - before):
+                return
+
+    async def _runSnapshot(self):
+        from .facebookSnapshot import SnapshotParser
+        Scrapper = self.Scrapper
+
+        async with SnapshotParser() as parser:
+            idle = 0
+            while idle < self.idle_scrolls:
+                before = self.emitted
+                try:
+                    async with Scrapper.arena():
+                        Scrapper.track(await self.page.wait_for_selector('div[aria-label="Like"]', state='attached'))
+                    await self.page.evaluate(EXPAND_SEE_MORE_JS)
+
+                    for postClass in await parser.parse(await Scrapper.html()):
+                        if self._isKnown(postClass.username, postClass.content, postClass.post_url):
+                            if self._caughtUp():
+                                return
+                            continue
+
+                        self._remember(postClass)
+
+                        await self._emit_post(postClass)
+                except Exception as e:
+                    Scrapper.log.warning("Failed to get post details", exc_info=e)
+                    await Scrapper.scroll(0, 500, duration=0.1, steps=30)
+                    break
+
+                idle = 0 if self.emitted > before else idle + 1
+                if not await self._advance(self.emitted - before):
+                    return
+
+    async def _runNetwork(self):
+        from .facebookGraphQL import parseResponse
+        Scrapper = self.Scrapper
+        found = asyncio.Queue()
+
+        async def onGraphQL(response):
+            for post in parseResponse(await response.text(), self.validate):
+                found.put_nowait(post)
+
+        unsubscribe = Scrapper.onResponse("*/api/graphql/*", onGraphQL)
+        try:
+            await Scrapper.open(self.url)
+
+            if self.recent and self.mentions:
+                await self._setLatest()
+
+            # the first page of the feed is embedded in the document, not fetched
+            for body in await self.page.evaluate(EMBEDDED_JSON_JS):
+                for post in parseResponse(body, self.validate):
+                    found.put_nowait(post)
+
+            idle = 0
+            while idle < self.idle_scrolls:
+                before = self.emitted
+                while not found.empty():
+                    postClass = found.get_nowait()
+                    if self._isKnown(postClass.username, postClass.content, postClass.post_url):
+                        if self._caughtUp():
+                            return
+                        continue
+
+                    self._remember(postClass)
+
+                    await self._emit_post(postClass)
+
+                idle = 0 if self.emitted > before else idle + 1
+                if not await self._advance(self.emitted - before):
+                    return
+                if self.pacer is None:
+                    await Scrapper.sleep(0.5)
+        finally:
+            unsubscribe()
+
+    async def extractPosts(self) -> list['PostSnapshot']:
+        """Read every post on the page in a single round-trip."""
+        return self._toSnapshots(await self.page.evaluate(EXTRACT_POSTS_JS))
+
+    async def drainPosts(self) -> list['PostSnapshot']:
+        """Read only the posts inserted since the previous call, in a single round-trip."""
+        return self._toSnapshots(await self.page.evaluate(DRAIN_POSTS_JS, self.prune))
+
+    async def _logMemory(self):
+        if not self.Scrapper.log.isEnabledFor(logging.DEBUG):
+            # pageMetrics is a CDP round-trip; skip it when nothing would be logged
+            return
+        metrics = await self.Scrapper.pageMetrics()
+        self.Scrapper.log.debug(
+            f"DOM nodes: {metrics['nodes']}, JS heap: {metrics['js_heap_used'] / 1e6:.1f} MB, "
+            f"live handles: {self.Scrapper.handles.live}, posts: {len(self.index)}"
+        )
+
+    def _toSnapshots(self, records: list[dict]) -> list['PostSnapshot']:
+        snapshots = []
+        for record in records:
+            record["content"] = record["content"].replace('\n', ' ')
+            snapshots.append(PostSnapshot(**record))
+        return snapshots
+
+    def _isKnown(self, username: str, content: str, url: str | None = None) -> bool:
+        keys = self.index.keysFor(username, content, url)
+        if not self.index.containsKeys(keys):
+            return False
+        if self.previous.containsKeys(keys):
+            self._knownStreak.add(keys[0])
+        return True
+
+    def _newPost(self, **fields) -> 'Post':
+        return Post(**fields) if self.validate else Post.model_construct(**fields)
+
+    def _caughtUp(self) -> bool:
+        """True once enough posts from earlier runs were seen in a row (recent mode only)."""
+        if self.recent and len(self._knownStreak) >= self.stop_after_known:
+            self.Scrapper.log.info(f"Caught up with earlier runs of {self.url}")
+            return True
+        return False
+
+    def _remember(self, post: 'Post'):
+        keys = self.index.keysFor(post.username, post.content, post.post_url)
+        self.index.addKeys(keys)
+        self._knownStreak.clear()
+        self.emitted += 1
+        if self.Scrapper.metrics is not None:
+            self.Scrapper.metrics.postEmitted()
+        if self.seen_store is not None:
+            self.seen_store.add(self.url, keys)
+        self.posts.append(post)
 
     async def _emit_post(self, post: 'Post'):
         """
@@ -108,21 +713,22 @@ class FacebookBetter:
                 self.Scrapper.log.warning("on_post callback failed", exc_info=e)
 
     async def _checkSeeMore(self, postDiv: ElementHandle) -> None:
-        button_locator = await postDiv.query_selector('[role="button"]:has-text("See more")')
-        if button_locator and await button_locator.is_visible():
-            await button_locator.click()
+        button_locator = await self.Scrapper.querySelector(postDiv, '[role="button"]:has-text("See more")')
+        if await self.Scrapper.isVisible(button_locator):
+            await self.Scrapper.click(button_locator)
 
     async def _setLatest(self):
         await self.page.locator("div[aria-label='Sort']").click()
-        sortby = await self.page.wait_for_selector("div[aria-label='Sort by']")
-        mostRecent = await self.Scrapper.traverseElement(sortby, [2, 0, 1])
-        await mostRecent.click()
-        apply = await self.Scrapper.traverseElement(sortby, [3, 0, 1])
-        await apply.click()
+        async with self.Scrapper.arena():
+            sortby = self.Scrapper.track(await self.page.wait_for_selector("div[aria-label='Sort by']"))
+            mostRecent = await self.Scrapper.traverseElement(sortby, [2, 0, 1])
+            await self.Scrapper.click(mostRecent)
+            apply = await self.Scrapper.traverseElement(sortby, [3, 0, 1])
+            await self.Scrapper.click(apply)
 
     async def getUniqueID(self, postDiv: ElementHandle) -> str:
         profileNameTag = await self.Scrapper.attribSearch(postDiv, "data-ad-rendering-role", "profile_name")
-        profileURLTag = await profileNameTag.query_selector("a[href]")
+        profileURLTag = self.Scrapper.track(await profileNameTag.query_selector("a[href]"))
         return await self.Scrapper.getAttr(profileURLTag, "href")
 
     async def _getPostBody(self, postDiv: ElementHandle) -> str:
@@ -137,71 +743,24 @@ class FacebookBetter:
         return await self.Scrapper.traverseElement(postDiv, [1, 0, 1, 0, 1, 0, 0, 0, 0])
 
     def _toEpoch(self, dateString: str):
-        try:
-            dt = datetime.strptime(dateString, "%A %d %B %Y at %H:%M")
-            return int(dt.timestamp())
-        except:
-            return 0
+        return toEpoch(dateString)
 
     def _strip(self, str: str) -> str:
-        return str.replace(" ", "").replace("\n", "").replace(" ", "").replace("Verifiedaccount", "")
+        return normalize(str)
 
     async def _getTime(self, timeTag: ElementHandle) -> int:
-        mouse = self.page.mouse
-        box = await timeTag.bounding_box()
-        if not box:
-            self.Scrapper.scrollTo(timeTag, 0.05, 10)
-            box = await timeTag.bounding_box()
-
-        target_x = box["x"] + box["width"] / 2
-        target_y = box["y"] + box["height"] / 2
-
-        while True:
-            newTimeBox = await self.page.query_selector('div.__fb-dark-mode[class="__fb-dark-mode"]')
-            if newTimeBox:
-                break
-            await timeTag.scroll_into_view_if_needed(timeout=1000)
-            await mouse.move(target_x, target_y)
-
-        time = self._toEpoch(await self.Scrapper.getText(newTimeBox))
-        await mouse.move(0, 0)
-        return time
+        return await self.times.resolve(timeTag)
 
     def parseURL(self, url: str) -> str:
-        parsed = urlparse(url)
-        query = parse_qs(parsed.query)
-        filtered_query = {k: v for k, v in query.items() if not (k.startswith("__cft__") or k.startswith("__tn__"))}
-        clean_query = urlencode(filtered_query, doseq=True)
-        return urlunparse(parsed._replace(query=clean_query))
-
-    async def _getURL(self, timeTag: ElementHandle):
-        timeTag = await self.Scrapper.traverseElement(timeTag, [0])
-        url = await self.Scrapper.getAttr(timeTag, "href")
-        if url != '':
-            url = self.parseURL(url)
-        return url
+        return parseURL(url)
+
+    async def _getURL(self, timeTag: ElementHandle | None) -> str:
+        if timeTag is None:
+            return ''
+        return permalink((await self.Scrapper.query(timeTag, TIME_LINK))["url"])
 
     def _convert_shorthand_number(self, value) -> int:
-        if value is None:
-            return 0
-        if isinstance(value, (int, float)):
-            return int(value)
-        if isinstance(value, str):
-            s = value.strip().upper().replace(",", "")
-            if not s:
-                return 0
-            try:
-                if s.endswith("K"):
-                    return int(float(s[:-1]) * 1_000)
-                elif s.endswith("M"):
-                    return int(float(s[:-1]) * 1_000_000)
-                elif s.endswith("B"):
-                    return int(float(s[:-1]) * 1_000_000_000)
-                else:
-                    return int(float(s))
-            except ValueError:
-                pass
-        return 0
+        return shorthandNumber(value)
 
     async def _getReactions(self, postDiv: ElementHandle) -> int:
         details = await self.Scrapper.traverseElement(postDiv, [3, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1])
@@ -216,3 +775,13 @@ class Post(BaseModel):
     username: str
     content: str
     reactions: int | None
+
+
+class PostSnapshot(BaseModel):
+    index: int
+    username: str
+    content: str
+    post_url: str
+    reactions_text: str
+    is_reel: bool
+    time_id: str | None
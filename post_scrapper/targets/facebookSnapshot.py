@@ -0,0 +1,135 @@
+import asyncio
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import lxml.html
+import lxml.etree as etree
+from .facebookPosts import Post, permalink, shorthandNumber
+
+# Same markers the live FacebookBetter modes walk, compiled once per process.
+LIKE_BUTTONS = etree.XPath('//div[@aria-label="Like"]')
+PROFILE_NAME = etree.XPath('.//*[@data-ad-rendering-role="profile_name"]')
+STORY_MESSAGE = etree.XPath('.//*[@data-ad-rendering-role="story_message"]')
+
+BLOCK_TAGS = {"div", "p", "li", "ul", "ol", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article"}
+
+def _children(el) -> list:
+    return [child for child in el if isinstance(child.tag, str)]
+
+
+def _parent(el, depth: int):
+    for _ in range(depth):
+        if el is None:
+            return None
+        el = el.getparent()
+    return el
+
+
+def _traverse(el, path: list[int]):
+    for idx in path:
+        if el is None:
+            return None
+        children = _children(el)
+        if idx >= len(children):
+            return None
+        el = children[idx]
+    return el
+
+
+def _innerText(el) -> str:
+    """Rough innerText: block elements and <br> become line breaks."""
+    if el is None:
+        return ""
+    parts = []
+
+    def walk(node):
+        if not isinstance(node.tag, str):
+            return
+        block = node.tag in BLOCK_TAGS
+        if node.tag == "br":
+            parts.append("\n")
+        if block and parts and not parts[-1].endswith("\n"):
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block and parts and not parts[-1].endswith("\n"):
+            parts.append("\n")
+
+    walk(el)
+    return "".join(parts).strip("\n")
+
+
+def parseSnapshot(html: str) -> list[Post]:
+    """
+    Extract posts from a feed HTML snapshot (page.content() or a saved copy).
+    Snapshots carry no hover tooltip, so `epoch` is 0, and time links still hold
+    their placeholder href, so `post_url` is only set when it is a permalink.
+    """
+    if not html.strip():
+        return []
+    root = lxml.html.fromstring(html)
+
+    posts = []
+    seen = set()
+    for likeButton in LIKE_BUTTONS(root):
+        outerButtons = _parent(likeButton, 2)
+        if outerButtons is None or len(_children(outerButtons)) < 3:
+            continue
+        postDiv = _parent(likeButton, 9)
+        if postDiv is None or postDiv in seen:
+            continue
+        seen.add(postDiv)
+
+        possibleReelTag = _traverse(postDiv, [1])
+        if possibleReelTag is not None and possibleReelTag.get("aria-label") == "Open reel in Reels Viewer":
+            continue
+
+        names = PROFILE_NAME(postDiv)
+        bodies = STORY_MESSAGE(postDiv)
+        link = _traverse(postDiv, [1, 0, 1, 0, 1, 0, 0, 0, 0, 0])
+        url = link.get("href", "") if link is not None else ""
+        reactions = _traverse(postDiv, [3, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1])
+
+        posts.append(Post(
+            post_url=permalink(url),
+            epoch=0,
+            username=_innerText(names[0]) if names else "",
+            content=(_innerText(bodies[0]) if bodies else "").replace("\n", " "),
+            reactions=shorthandNumber(_innerText(reactions)),
+        ))
+    return posts
+
+
+def parseSnapshotFile(path: str) -> list[Post]:
+    with open(path, encoding="utf-8") as f:
+        return parseSnapshot(f.read())
+
+
+class SnapshotParser:
+    """
+    Runs parseSnapshot in a process pool so the browser loop never blocks on lxml.
+    Workers are spawned, not forked from the process running the browser loop.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+
+    async def __aenter__(self) -> "SnapshotParser":
+        return self
+
+    async def __aexit__(self, exc_t, exc_v, exc_tb):
+        self.close()
+
+    async def parse(self, html: str) -> list[Post]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, parseSnapshot, html)
+
+    async def parseFile(self, path: str) -> list[Post]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, parseSnapshotFile, path)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
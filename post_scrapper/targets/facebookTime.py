@@ -0,0 +1,154 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from patchright.async_api import Page, ElementHandle
+from ..scrapper import Scrapper
+from ..dedupe import isPermalink
+
+# Tooltip Facebook shows while a post's time link is hovered
+TOOLTIP = 'div.__fb-dark-mode[class="__fb-dark-mode"]'
+
+# Timestamps Facebook sometimes leaves on the link itself, checked before
+# falling back to hovering. Every candidate is returned, since labels such as
+# "2h" are present but not parseable.
+READ_TIME_JS = """
+(el) => {
+    const found = [];
+    const candidates = [el, ...el.querySelectorAll('[data-utime], time[datetime], abbr[title], a[aria-label]')];
+    for (const c of candidates) {
+        const utime = c.getAttribute('data-utime');
+        if (utime) found.push({epoch: parseInt(utime, 10)});
+        const iso = c.getAttribute('datetime');
+        if (iso) found.push({text: iso});
+        const label = c.getAttribute('title') || c.getAttribute('aria-label');
+        if (label) found.push({text: label});
+    }
+    return found;
+}
+"""
+
+VIEWPORT_BOXES_JS = """
+(els) => els.map(el => {
+    if (!el || !el.isConnected) return null;
+    const rect = el.getBoundingClientRect();
+    const inView = rect.top >= 0 && rect.bottom <= window.innerHeight && rect.width > 0;
+    return inView ? {x: rect.x, y: rect.y, width: rect.width, height: rect.height} : null;
+})
+"""
+
+
+def toEpoch(dateString: str) -> int:
+    for parse in (
+        lambda s: datetime.strptime(s, "%A %d %B %Y at %H:%M"),
+        lambda s: datetime.strptime(s, "%A, %B %d, %Y at %I:%M %p"),
+        datetime.fromisoformat,
+    ):
+        try:
+            return int(parse(dateString.strip()).timestamp())
+        except (ValueError, TypeError):
+            continue
+    return 0
+
+
+class TimeResolver:
+    """
+    Resolves post timestamps with as little hovering as possible.
+
+    Times are cached by post permalink and read from the link's own attributes when
+    Facebook provides them. Otherwise the link is hovered and the tooltip is
+    awaited with a bound of `timeout` seconds. resolveMany() hovers every link
+    already in the viewport before scrolling to the rest.
+
+    Un-hovered links carry only a shared placeholder, so resolving never
+    caches anything: callers store() each epoch under the permalink the link
+    holds once hovered.
+    """
+
+    def __init__(self, scrapper: Scrapper, cache_size: int = 5000, timeout: float = 2.0):
+        self.Scrapper = scrapper
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self._cache: OrderedDict[str, int] = OrderedDict()
+
+    @property
+    def page(self) -> Page:
+        return self.Scrapper.page
+
+    def cached(self, url: str | None) -> int | None:
+        if not isPermalink(url) or url not in self._cache:
+            return None
+        self._cache.move_to_end(url)
+        return self._cache[url]
+
+    def store(self, url: str | None, epoch: int):
+        if not isPermalink(url) or not epoch:
+            return
+        self._cache[url] = epoch
+        self._cache.move_to_end(url)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def _fromAttributes(self, timeTag: ElementHandle) -> int:
+        for found in await self.Scrapper.evaluateOn(timeTag, READ_TIME_JS):
+            epoch = found["epoch"] if "epoch" in found else toEpoch(found["text"])
+            if epoch:
+                return epoch
+        return 0
+
+    async def _hover(self, box: dict) -> int:
+        mouse = self.page.mouse
+        await mouse.move(box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
+        try:
+            async with self.Scrapper.arena():
+                tooltip = self.Scrapper.track(
+                    await self.page.wait_for_selector(TOOLTIP, state="visible", timeout=self.timeout * 1000)
+                )
+                epoch = toEpoch(await self.Scrapper.getText(tooltip))
+        except Exception:
+            self.Scrapper.log.debug("Timestamp tooltip did not appear")
+            epoch = 0
+        await mouse.move(0, 0)
+        try:
+            await self.page.wait_for_selector(TOOLTIP, state="hidden", timeout=self.timeout * 1000)
+        except Exception:
+            pass
+        return epoch
+
+    async def resolve(self, timeTag: ElementHandle, url: str | None = None) -> int:
+        return (await self.resolveMany([(timeTag, url)]))[0]
+
+    async def resolveMany(self, tags: list[tuple[ElementHandle, str | None]]) -> list[int]:
+        """Epoch for each (time link, cached permalink) pair; 0 when it can't be resolved."""
+        times = [0] * len(tags)
+        todo = []
+        for i, (timeTag, url) in enumerate(tags):
+            cached = self.cached(url)
+            if cached is not None:
+                times[i] = cached
+            elif timeTag is not None:
+                todo.append(i)
+
+        if todo:
+            epochs = await asyncio.gather(*(self._fromAttributes(tags[i][0]) for i in todo))
+            for i, epoch in zip(todo, epochs):
+                times[i] = epoch
+            todo = [i for i, epoch in zip(todo, epochs) if not epoch]
+
+        while todo:
+            handles = [tags[i][0] for i in todo]
+            boxes = await self.page.evaluate(VIEWPORT_BOXES_JS, handles)
+            visible = [(i, box) for i, box in zip(todo, boxes) if box]
+            if not visible:
+                # nothing on screen: bring the next one into view and try again
+                nextTag = tags[todo[0]][0]
+                await self.Scrapper.scrollTo(nextTag, 0.05, 10)
+                box = await self.Scrapper.boundingBox(nextTag)
+                if box:
+                    visible = [(todo[0], box)]
+                else:
+                    todo.pop(0)
+                    continue
+            for i, box in visible:
+                times[i] = await self._hover(box)
+                todo.remove(i)
+        return times
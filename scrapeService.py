@@ -0,0 +1,21 @@
+import asyncio
+import argparse
+from post_scrapper import BrowserPool
+from post_scrapper.service import ScrapeService
+
+
+async def main(args):
+    async with BrowserPool(size=args.contexts, pages_per_context=args.pages, headless=args.headless) as pool:
+        service = ScrapeService(pool, args.host, args.port, args.socket, args.contexts * args.pages)
+        await service.serve()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Keep a browser warm and run scrape jobs submitted over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--socket", help="listen on this Unix socket instead of host:port")
+    parser.add_argument("--contexts", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=4, help="pages per context")
+    parser.add_argument("--headless", action="store_true")
+    asyncio.run(main(parser.parse_args()))
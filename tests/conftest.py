@@ -0,0 +1,24 @@
+import asyncio
+import functools
+import pytest
+
+
+@functools.cache
+def chromeAvailable() -> bool:
+    """Whether patchright can launch the Chrome channel the Scrapper uses."""
+    async def launch():
+        from patchright.async_api import async_playwright
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(channel="chrome", headless=True)
+            await browser.close()
+    try:
+        asyncio.run(launch())
+    except Exception:
+        return False
+    return True
+
+
+@pytest.fixture
+def chrome():
+    if not chromeAvailable():
+        pytest.skip("Chrome is not installed")
@@ -0,0 +1,8 @@
+import pytest
+from post_scrapper.bench import isolatedBenchmark
+
+
+@pytest.mark.parametrize("mode", ["dom", "evaluate", "snapshot"])
+def test_fixed_pacing_terminates(chrome, mode):
+    result = isolatedBenchmark(mode=mode, posts=30, batch=10, latency=0.05, pacing="fixed", timeout=180)
+    assert result["posts"] > 0
@@ -0,0 +1,60 @@
+import os
+import lxml.html
+from post_scrapper.dedupe import PostIndex, SeenStore, isPermalink
+from post_scrapper.targets.facebookPosts import FacebookBetter, parseURL
+from post_scrapper.targets.facebookSnapshot import parseSnapshotFile
+
+FEED = os.path.join(os.path.dirname(__file__), "..", "temp.txt")
+
+
+def placeholder() -> str:
+    """The saved feed's time link href, as it is before any hover."""
+    with open(FEED, encoding="utf-8") as f:
+        root = lxml.html.fragment_fromstring(f.read(), create_parent="div")
+    href, = {a.get("href") for a in root.iter("a") if "#?fkj" in (a.get("href") or "")}
+    return parseURL(href)
+
+
+def test_placeholder_href_is_not_a_permalink():
+    url = placeholder()
+    assert url == "#?fkj"
+    assert not isPermalink(url)
+    assert len(PostIndex().keysFor("Razer", "post", url)) == 1
+
+
+def test_snapshot_posts_have_no_placeholder_url():
+    post, = parseSnapshotFile(FEED)
+    assert post.post_url == ""
+
+
+def test_placeholder_href_does_not_merge_posts():
+    post, = parseSnapshotFile(FEED)
+    url = placeholder()
+    fb = FacebookBetter("Razer")
+    fb.index.add(post.username, post.content, url)
+
+    assert fb._isKnown(post.username, post.content, url)
+    assert not fb._isKnown("Bob", "totally different", url)
+    assert not fb._knownStreak
+
+
+def test_permalinks_still_dedupe():
+    index = PostIndex()
+    url = "https://www.facebook.com/Razer/posts/pfbid02abc"
+    index.add("Razer", "first", url)
+    assert index.contains("Razer", "edited text", url)
+    assert isPermalink("https://www.facebook.com/permalink.php?story_fbid=1&id=2")
+    assert not isPermalink("https://www.facebook.com/Razer")
+
+
+def test_seen_store_commits_in_batches(tmp_path):
+    path = str(tmp_path / "seen.db")
+    store = SeenStore(path, commit_every=2)
+    store.add("profile", ["a"])
+    assert store.keys("profile") == ["a"]
+    assert SeenStore(path).keys("profile") == []
+    store.add("profile", ["b"])
+    assert sorted(SeenStore(path).keys("profile")) == ["a", "b"]
+    store.add("profile", ["c"])
+    store.close()
+    assert sorted(SeenStore(path).keys("profile")) == ["a", "b", "c"]
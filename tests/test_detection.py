@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import tempfile
+from contextlib import asynccontextmanager
+import pytest
+from post_scrapper import Scrapper
+from post_scrapper.bench import FeedServer
+from post_scrapper.targets.detection_check import Check, runSuite, defaultChecks
+
+# Stand-ins carrying just the result markup each built-in check reads
+VERDICTS = {
+    "fingerprint.com": {
+        "pass": '<h3 class="HeroSection-module--botSubTitle--x1">You are not a bot</h3>',
+        "fail": '<h3 class="HeroSection-module--botSubTitle--x1">You are a bot</h3>',
+    },
+    "iphey.com": {
+        "pass": '<div class="loader hide"></div><div class="identity-status__status trustworthy">Trustworthy</div>',
+        "fail": '<div class="loader hide"></div><div class="identity-status__status unreliable">Unreliable</div>',
+    },
+    "browserscan.net": {
+        "pass": "<p><strong>Test Results:</strong> <strong>Normal</strong></p>",
+        "fail": "<p><strong>Test Results:</strong> <strong>Robot</strong></p>",
+    },
+}
+
+
+def standIns() -> dict[str, str]:
+    return {
+        f"/{name}/{verdict}": f"<!DOCTYPE html><html><body>{body}</body></html>"
+        for name, bodies in VERDICTS.items()
+        for verdict, body in bodies.items()
+    }
+
+
+async def checkStandIns(verdict: str):
+    async with FeedServer(posts=0, pages=standIns()) as server:
+        urls = {name: f"{server.url}{name}/{verdict}" for name in VERDICTS}
+        with tempfile.TemporaryDirectory(prefix="detection-chromedata-") as profile:
+            async with Scrapper(headless=True, user_data_dir=profile, log_level=logging.WARNING, interactive=False) as s:
+                return await runSuite({"default": s}, defaultChecks(urls, timeout=10))
+
+
+@pytest.mark.parametrize("verdict", ["pass", "fail"])
+def test_builtin_checks_on_stand_ins(chrome, verdict):
+    results = asyncio.run(checkStandIns(verdict))
+    assert sorted(result.check for result in results) == sorted(VERDICTS)
+    for result in results:
+        assert result.error is None
+        assert result.passed == (verdict == "pass"), result
+
+
+class FixedCheck(Check):
+    name = "fixed"
+    good = ("Normal",)
+
+    def __init__(self, status: str | Exception):
+        super().__init__("http://stand-in/")
+        self.status = status
+
+    async def read(self, page) -> str:
+        if isinstance(self.status, Exception):
+            raise self.status
+        return self.status
+
+
+class StubSource:
+    """A page source whose pages never load anything."""
+
+    def __init__(self):
+        self.page = None
+
+    async def open(self, url):
+        pass
+
+    @asynccontextmanager
+    async def lease(self):
+        yield self
+
+
+def test_run_suite_verdicts():
+    checks = [FixedCheck("Normal"), FixedCheck("Robot"), FixedCheck(TimeoutError("no verdict"))]
+    results = asyncio.run(runSuite({"a": StubSource(), "b": StubSource()}, checks))
+    assert [result.profile for result in results] == ["a"] * 3 + ["b"] * 3
+    assert [result.passed for result in results] == [True, False, False] * 2
+    assert results[2].error == "TimeoutError: no verdict"
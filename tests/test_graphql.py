@@ -0,0 +1,31 @@
+import json
+from post_scrapper.targets.facebookGraphQL import parseResponse
+
+
+def story(n: int, url: str | None = None) -> dict:
+    node = {
+        "__typename": "Story",
+        "post_id": str(n),
+        "actors": [{"name": "Razer", "url": "https://www.facebook.com/Razer"}],
+        "message": {"text": f"post {n}"},
+        "creation_time": 1_700_000_000 + n,
+    }
+    if url:
+        node["url"] = url
+    return node
+
+
+def test_stories_come_out_in_feed_order():
+    body = json.dumps({"data": {"edges": [{"node": story(n, f"https://www.facebook.com/Razer/posts/u{n}")} for n in (1, 2, 3)]}})
+    assert [post.post_url for post in parseResponse(body)] == [
+        "https://www.facebook.com/Razer/posts/u1",
+        "https://www.facebook.com/Razer/posts/u2",
+        "https://www.facebook.com/Razer/posts/u3",
+    ]
+
+
+def test_actor_profile_url_is_not_the_post_url():
+    body = json.dumps({"data": {"edges": [{"node": story(n)} for n in (1, 2)]}})
+    posts = parseResponse(body)
+    assert [post.post_url for post in posts] == ["", ""]
+    assert [post.content for post in posts] == ["post 1", "post 2"]
@@ -0,0 +1,39 @@
+import re
+import asyncio
+import logging
+import tempfile
+import pytest
+from post_scrapper import Scrapper
+from post_scrapper.bench import FeedServer
+from post_scrapper.intercept import InterceptPolicy, PRESETS
+
+
+@pytest.mark.parametrize("preset", sorted(PRESETS))
+def test_presets_block_through_cdp(preset):
+    urls = InterceptPolicy.preset(preset).blockedURLs()
+    assert urls
+    assert "*://video*.fbcdn.net/*" in urls or preset == "no-trackers"
+
+
+def test_policies_cdp_cannot_express_fall_back_to_routing():
+    assert InterceptPolicy(allow_types=["document"]).blockedURLs() is None
+    assert InterceptPolicy(deny_urls=["*.png"], allow_urls=["*/logo.png"]).blockedURLs() is None
+    assert InterceptPolicy(deny_urls=[re.compile(r".*\.png")]).blockedURLs() is None
+    assert InterceptPolicy(deny_types=["script"]).blockedURLs() is None
+
+
+async def scrapeFeed(preset: str) -> int:
+    from post_scrapper.targets.facebookPosts import FacebookBetter
+    async with FeedServer(posts=20, batch=10, latency=0.05) as server:
+        with tempfile.TemporaryDirectory(prefix="intercept-chromedata-") as profile:
+            async with Scrapper(headless=True, user_data_dir=profile, log_level=logging.WARNING, interactive=False, intercept=preset) as s:
+                fb = FacebookBetter("bench", mentions=False, mode="evaluate")
+                fb.url = server.url
+                await s.setJob(fb)
+                await asyncio.wait_for(s.start(), 120)
+                return fb.emitted
+
+
+@pytest.mark.parametrize("preset", sorted(PRESETS))
+def test_extraction_under_preset(chrome, preset):
+    assert asyncio.run(scrapeFeed(preset)) == 20
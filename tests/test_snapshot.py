@@ -0,0 +1,17 @@
+from bs4 import BeautifulSoup
+from post_scrapper.snapshot import DomSnapshot
+
+# a <div> inside a <p>: html.parser keeps it nested, lxml would close the <p>
+PAGE = "<!DOCTYPE html><html><body><p>a<div><span>x</span></div></p><span>y</span></body></html>"
+
+
+def test_tags_resolve_across_invalid_nesting():
+    tags = BeautifulSoup(PAGE, "html.parser").find_all("span")
+    snapshot = DomSnapshot(PAGE.replace(">x<", ">x2<"))
+    assert [tag.text for tag in map(snapshot.toTag, snapshot.resolve(tags))] == ["x2", "y"]
+
+
+def test_missing_tags_resolve_to_none():
+    tags = BeautifulSoup(PAGE, "html.parser").find_all("span")
+    snapshot = DomSnapshot("<html><body><span>y</span></body></html>")
+    assert [tag and tag.text for tag in snapshot.resolve(tags)] == [None, "y"]
@@ -0,0 +1,25 @@
+import asyncio
+from post_scrapper.targets.facebookTime import TimeResolver
+
+PERMALINK = "https://www.facebook.com/Razer/posts/pfbid02abc"
+
+
+def test_placeholder_urls_are_not_cached():
+    times = TimeResolver(None)
+    times.store("#?fkj", 1700000000)
+    assert times.cached("#?fkj") is None
+    # a later post with the same placeholder must not inherit that epoch
+    assert asyncio.run(times.resolve(None, "#?fkj")) == 0
+
+
+def test_permalinks_are_cached():
+    times = TimeResolver(None)
+    times.store(PERMALINK, 1700000000)
+    assert asyncio.run(times.resolve(None, PERMALINK)) == 1700000000
+
+
+def test_resolving_leaves_caching_to_the_caller():
+    # the URL passed in is the pre-hover one; only the resolved permalink is stored
+    times = TimeResolver(None)
+    asyncio.run(times.resolveMany([(None, PERMALINK)]))
+    assert times.cached(PERMALINK) is None